@@ -11,3 +11,43 @@ PATHS = {
     "coffin": "graphics/monster/coffin",
     "cactus": "graphics/monster/cactus",
 }
+
+ASSET_LOADER_WORKERS = 4
+ASSET_BUNDLE_DIR = "bundle"  # Gerado por python -m src.core.asset_bundle
+LOADING_FRAME_BUDGET_MS = 8  # Tempo máximo por frame gasto convertendo assets
+
+MAX_VOICES_PER_SOUND = 4
+SOUND_MAX_DISTANCE = 1000  # Sons mais distantes do jogador não são tocados
+
+SIMULATION_TICK_RATE = 60  # Passos fixos de simulação por segundo
+MAX_SIMULATION_STEPS = 5  # Limite de passos executados em um único frame
+PACING_BUSY_WAIT_MS = 2  # Coloque 0 para apenas usar sleep na espera do frame
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7777
+SNAPSHOT_RATE = 20  # Snapshots enviados por segundo para cada cliente
+NETWORK_VIEW_MARGIN = 256  # Margem além da tela enviada para cada cliente
+SERVER_REPORT_INTERVAL = 5  # Segundos entre relatórios do servidor
+
+ENDLESS_WAVES = False  # Coloque True para jogar em ondas infinitas de inimigos
+WAVE_BASE_SIZE = 10
+WAVE_GROWTH = 10  # Inimigos adicionados a cada nova onda
+WAVE_DELAY_MS = 5000
+WAVE_SPAWNS_PER_FRAME = 8
+WAVE_PREWARM_PER_FRAME = 4
+
+BEHAVIOURS_PATH = "data/behaviours.json"
+AI_BUDGET_MS = 2  # Tempo máximo por tick para os inimigos decidirem o que fazer
+
+# Defina esta variável de ambiente para iniciar o profiler ligado
+PROFILER_ENV_VAR = "WS_PROFILE"
+PROFILER_INTERVAL_MS = 10
+PROFILER_HISTORY = 600  # Frames mantidos no buffer circular
+PROFILER_DIR = "profiles"
+
+FRAME_BUDGET_MS = 1000 / (FRAME_RATE_LIMITER or SIMULATION_TICK_RATE)
+SPIKE_LOG_INTERVAL = 1  # Segundos entre dois avisos de frames lentos
+
+GC_MANAGED = True  # Coleta de lixo no tempo ocioso dos frames
+GC_THRESHOLDS = (10000, 50, 100)  # Coleta automática, só como garantia
+GC_IDLE_THRESHOLDS = (700, 10, 10)
@@ -0,0 +1,320 @@
+"""Packs the animation frames into atlases that load without decoding
+a PNG per frame.
+
+Identical frames are stored once, and each frame is trimmed to its
+visible pixels, keeping its offset inside the original image. The
+atlases are written as raw RGBA pixels, which are memory-mapped when
+loaded, next to an index describing every frame and animation, and the
+modification time and size of the images each animation directory was
+built from, so the directories whose images changed are loaded from the
+loose images instead.
+
+Run from the project root after changing the images:
+
+    $ python -m src.core.asset_bundle [output_dir]
+"""
+
+import os
+import sys
+import json
+import mmap
+from hashlib import blake2b
+from typing import Any, Iterable
+
+import pygame
+from pygame.rect import Rect
+from pygame.surface import Surface
+from pygame.image import load as load_image, tobytes, frombuffer
+
+BUNDLE_VERSION = 2
+INDEX_FILE = "index.json"
+
+
+def list_animation_files(path: str) -> dict[str, list[str]]:
+    """Finds the frames of each animation inside a directory tree. The
+    animations are the leaf directories, and their frames are sorted by
+    the number in the file name.
+
+    Args:
+        path (str): The root directory.
+
+    Returns:
+        dict[str, list[str]]: A dictionary mapping animation names to
+            the paths of their frames.
+    """
+    animations = {}
+
+    for root, dirs, files in os.walk(path):
+        if not dirs:
+            animations[root.split("/")[-1]] = [
+                f"{root}/{file}"
+                for file in sorted(files, key=lambda f: int(f.split(".")[0]))
+            ]
+
+    return animations
+
+
+def source_stamps(path: str) -> dict[str, list[int]]:
+    """Finds the modification time, in nanoseconds, and the size of
+    every frame inside a directory tree.
+
+    Args:
+        path (str): The root directory.
+
+    Returns:
+        dict[str, list[int]]: A dictionary mapping frame paths to their
+            modification time and size.
+    """
+    stamps = {}
+
+    for files in list_animation_files(path).values():
+        for file in files:
+            stat = os.stat(file)
+            stamps[file] = [stat.st_mtime_ns, stat.st_size]
+
+    return stamps
+
+
+def pack(sizes: list[tuple[int, int]], page_size: int) -> list[tuple[int, int, int]]:
+    """Places rectangles on pages in shelves, tallest first.
+
+    Args:
+        sizes (list[tuple[int, int]]): The sizes of the rectangles.
+        page_size (int): The size of the pages.
+
+    Returns:
+        list[tuple[int, int, int]]: The page, x and y of each rectangle,
+            in the order of `sizes`.
+    """
+    places = [(0, 0, 0)] * len(sizes)
+    page = x = y = shelf_height = 0
+
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        width, height = sizes[index]
+
+        if width > page_size or height > page_size:
+            raise ValueError(f"A {width}x{height} frame does not fit on a page")
+
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+
+        if y + height > page_size:
+            page, x, y, shelf_height = page + 1, 0, 0, 0
+
+        places[index] = (page, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    return places
+
+
+def build_bundle(
+    paths: Iterable[str], output_dir: str, page_size: int = 2048
+) -> dict[str, int]:
+    """Builds the bundle of the animations inside some directories.
+
+    Args:
+        paths (Iterable[str]): The animation directories, as passed to
+            `Entity.import_frames`.
+        output_dir (str): Where the index and the atlases are written.
+        page_size (int, optional): The size of the atlas pages.
+            Defaults to 2048.
+
+    Returns:
+        dict[str, int]: How many frames were found and stored, and the
+            bytes of their pixels before and after trimming.
+    """
+    frames: list[tuple[Surface, Rect]] = []
+    frame_ids: dict[bytes, int] = {}
+    animations: dict[str, dict[str, list[int]]] = {}
+    sources: dict[str, dict[str, list[int]]] = {}
+    stats = {"frames": 0, "unique": 0, "bytes": 0, "trimmed_bytes": 0}
+
+    for path in paths:
+        animations[path] = {}
+        sources[path] = source_stamps(path)
+
+        for name, files in list_animation_files(path).items():
+            animations[path][name] = ids = []
+
+            for file in files:
+                surface = load_image(file).convert_alpha()
+                width, height = surface.get_size()
+                key = blake2b(
+                    tobytes(surface, "RGBA") + bytes(f"{width}x{height}", "ascii")
+                ).digest()
+
+                if key not in frame_ids:
+                    frame_ids[key] = len(frames)
+                    frames.append((surface, surface.get_bounding_rect()))
+
+                ids.append(frame_ids[key])
+                stats["frames"] += 1
+                stats["bytes"] += width * height * 4
+
+    places = pack([trim.size for _, trim in frames], page_size)
+    heights = [0] * (max((page for page, _, _ in places), default=-1) + 1)
+
+    for (_, trim), (page, _, y) in zip(frames, places):
+        heights[page] = max(heights[page], y + trim.height)
+
+    # Only the last page is usually not full, so it is cropped.
+    pages = [Surface((page_size, height), pygame.SRCALPHA) for height in heights]
+    index_frames = []
+
+    for (surface, trim), (page, x, y) in zip(frames, places):
+        pages[page].blit(surface, (x, y), trim, pygame.BLEND_RGBA_MAX)
+        index_frames.append(
+            {
+                "page": page,
+                "rect": [x, y, trim.width, trim.height],
+                "offset": [trim.x, trim.y],
+                "size": list(surface.get_size()),
+            }
+        )
+        stats["trimmed_bytes"] += trim.width * trim.height * 4
+
+    os.makedirs(output_dir, exist_ok=True)
+    index_pages = []
+
+    for number, page in enumerate(pages):
+        file = f"atlas-{number}.rgba"
+
+        with open(os.path.join(output_dir, file), "wb") as blob:
+            blob.write(tobytes(page, "RGBA"))
+
+        index_pages.append({"file": file, "size": list(page.get_size())})
+
+    with open(os.path.join(output_dir, INDEX_FILE), "w") as index:
+        json.dump(
+            {
+                "version": BUNDLE_VERSION,
+                "pages": index_pages,
+                "frames": index_frames,
+                "animations": animations,
+                "sources": sources,
+            },
+            index,
+        )
+
+    stats["unique"] = len(frames)
+
+    return stats
+
+
+def has_bundle(bundle_dir: str) -> bool:
+    return os.path.isfile(os.path.join(bundle_dir, INDEX_FILE))
+
+
+def read_bundle(bundle_dir: str) -> tuple[dict[str, Any], list[Surface]]:
+    """Reads the index and maps the atlases of a bundle. It does not
+    touch the display, so it can run outside the main thread.
+
+    Args:
+        bundle_dir (str): The bundle directory.
+
+    Returns:
+        tuple[dict[str, Any], list[Surface]]: The index and the atlas
+            pages, whose pixels are backed by the mapped files. The
+            pages of a bundle built by another version are not mapped.
+    """
+    with open(os.path.join(bundle_dir, INDEX_FILE)) as file:
+        index = json.load(file)
+
+    pages = []
+
+    if index.get("version") != BUNDLE_VERSION:
+        return index, pages
+
+    for page in index["pages"]:
+        with open(os.path.join(bundle_dir, page["file"]), "rb") as file:
+            blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        pages.append(frombuffer(blob, page["size"], "RGBA"))
+
+    return index, pages
+
+
+def stale_paths(index: dict[str, Any], paths: Iterable[str]) -> list[str]:
+    """Finds the animation directories the bundle can't provide: the
+    ones it was not built from, and the ones whose images were added,
+    removed or changed since. Every directory is stale in a bundle
+    built by another version.
+
+    Args:
+        index (dict[str, Any]): The bundle index.
+        paths (Iterable[str]): The animation directories.
+
+    Returns:
+        list[str]: The stale directories, in the order of `paths`.
+    """
+    if index.get("version") != BUNDLE_VERSION:
+        return list(paths)
+
+    sources = index["sources"]
+
+    return [path for path in paths if sources.get(path) != source_stamps(path)]
+
+
+def unpack_bundle(
+    index: dict[str, Any], pages: list[Surface], paths: Iterable[str]
+) -> dict[str, dict[str, list[Surface]]]:
+    """Rebuilds the frames of some animation directories with their
+    original size, so the rects and hitboxes computed from them don't
+    change. Identical frames share the same surface.
+
+    Args:
+        index (dict[str, Any]): The bundle index.
+        pages (list[Surface]): The atlas pages.
+        paths (Iterable[str]): The animation directories to unpack.
+            They must not be stale.
+
+    Returns:
+        dict[str, dict[str, list[Surface]]]: The frames of each
+            animation, by animation directory and animation name.
+    """
+    # Converting the pages once is much faster than converting every
+    # frame, and frames with per-pixel alpha already get the format
+    # `convert_alpha` would give them.
+    pages = [page.convert_alpha() for page in pages]
+    frames: dict[int, Surface] = {}
+
+    def unpack_frame(id: int) -> Surface:
+        if id not in frames:
+            frame = index["frames"][id]
+            frames[id] = Surface(frame["size"], pygame.SRCALPHA)
+            frames[id].blit(
+                pages[frame["page"]],
+                frame["offset"],
+                frame["rect"],
+                pygame.BLEND_RGBA_MAX,
+            )
+
+        return frames[id]
+
+    return {
+        path: {
+            name: [unpack_frame(id) for id in ids]
+            for name, ids in index["animations"][path].items()
+        }
+        for path in paths
+    }
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    from settings import ASSET_BUNDLE_DIR, PATHS
+
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE_DIR
+    stats = build_bundle(PATHS.values(), output_dir)
+
+    print(
+        f"{stats['frames']} frames, {stats['unique']} unique, "
+        f"{stats['bytes'] / 2**20:.1f} MiB of pixels, "
+        f"{stats['trimmed_bytes'] / 2**20:.1f} MiB after trimming, "
+        f"written to {output_dir}"
+    )
@@ -0,0 +1,256 @@
+import os
+from time import perf_counter
+from typing import Any, Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+import pytmx
+from pygame.mixer import Sound
+from pygame.surface import Surface
+from pygame.image import load as load_image
+from pytmx.util_pygame import handle_transformation
+
+from src.core.asset_bundle import has_bundle, read_bundle, stale_paths, unpack_bundle
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def decode_image_loader(filename: str, colorkey: Any, **kwargs) -> Callable:
+    """pytmx image loader that only decodes the tileset image.
+
+    Unlike `pytmx.util_pygame.pygame_image_loader`, the tiles are not
+    converted to the display format, which makes this loader safe to
+    run outside the main thread. The conversion is done later by
+    `AssetLoader`.
+
+    Args:
+        filename (str): The tileset image to load.
+        colorkey (Any): Unused, kept for compatibility with pytmx.
+
+    Returns:
+        Callable: A function that extracts a tile from the tileset.
+    """
+    image = load_image(filename)
+
+    def extract_tile(rect=None, flags=None) -> Surface:
+        tile = image.subsurface(rect).copy() if rect else image.copy()
+
+        if flags:
+            tile = handle_transformation(tile, flags)
+
+        return tile
+
+    return extract_tile
+
+
+class AssetLoader:
+    def __init__(self, max_workers: int = 4) -> None:
+        self.executor = ThreadPoolExecutor(max_workers)
+
+        self.cache: dict[str, Any] = {}
+        self.animations: dict[str, dict[str, list[Surface]]] = {}
+        self.pending: list[tuple[str, Future, Callable[[Any], Any]]] = []
+
+        self.total = 0
+        self.completed = 0
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the queued assets that are ready to be used.
+
+        Returns:
+            float: A value between 0 and 1.
+        """
+        if self.total == 0:
+            return 1.0
+
+        return self.completed / self.total
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def queue(
+        self,
+        key: str,
+        decode: Callable[[], Any],
+        finalize: Callable[[Any], Any] | None = None,
+    ) -> None:
+        """Schedules an asset to be decoded on the thread pool.
+
+        Args:
+            key (str): The key used to retrieve the asset later.
+            decode (Callable[[], Any]): The function executed on the
+                thread pool. It must not touch the display.
+            finalize (Callable[[Any], Any] | None, optional): Function
+                executed on the main thread with the decoded value.
+                Defaults to None.
+        """
+        if key in self.cache or any(key == item[0] for item in self.pending):
+            return
+
+        self.pending.append(
+            (key, self.executor.submit(decode), finalize or (lambda value: value))
+        )
+        self.total += 1
+
+    def queue_image(self, path: str, alpha: bool = True) -> None:
+        """Schedules an image to be decoded and converted.
+
+        Args:
+            path (str): The image path.
+            alpha (bool, optional): Whether the image has per-pixel
+                alpha. Defaults to True.
+        """
+        self.queue(
+            path,
+            lambda: load_image(path),
+            lambda surface: surface.convert_alpha() if alpha else surface.convert(),
+        )
+
+    def queue_directory(self, path: str) -> None:
+        """Schedules every image inside a directory tree.
+
+        Args:
+            path (str): The root directory.
+        """
+        for root, _, files in os.walk(path):
+            for file in sorted(files):
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    self.queue_image(f"{root}/{file}")
+
+    def queue_animations(self, paths: Iterable[str], bundle_dir: str) -> None:
+        """Schedules the frames of some animation directories, from the
+        asset bundle when it was built, or else from the loose images.
+        The directories the bundle doesn't have, or whose images changed
+        after it was built, are also scheduled from the loose images.
+
+        Args:
+            paths (Iterable[str]): The animation directories.
+            bundle_dir (str): The asset bundle directory.
+        """
+        paths = list(paths)
+
+        if not has_bundle(bundle_dir):
+            for path in paths:
+                self.queue_directory(path)
+
+            return
+
+        def decode() -> tuple[dict[str, Any], list[Surface], list[str]]:
+            index, pages = read_bundle(bundle_dir)
+
+            return index, pages, stale_paths(index, paths)
+
+        def finalize(bundle: tuple[dict[str, Any], list[Surface], list[str]]) -> None:
+            index, pages, stale = bundle
+
+            for path in stale:
+                self.queue_directory(path)
+
+            self.animations.update(
+                unpack_bundle(
+                    index, pages, [path for path in paths if path not in stale]
+                )
+            )
+
+        self.queue(bundle_dir, decode, finalize)
+
+    def queue_sound(self, path: str, volume: float = 1.0) -> None:
+        """Schedules a sound to be decoded.
+
+        Args:
+            path (str): The sound path.
+            volume (float, optional): The sound volume. Defaults to 1.0.
+        """
+
+        def finalize(sound: Sound) -> Sound:
+            sound.set_volume(volume)
+            return sound
+
+        self.queue(path, lambda: Sound(path), finalize)
+
+    def queue_map(self, path: str) -> None:
+        """Schedules a TMX map to be parsed, converting its tiles to
+        the display format once it is ready.
+
+        Args:
+            path (str): The TMX map path.
+        """
+
+        def finalize(tmx_map: pytmx.TiledMap) -> pytmx.TiledMap:
+            tmx_map.images = [
+                image.convert_alpha() if image is not None else None
+                for image in tmx_map.images
+            ]
+
+            return tmx_map
+
+        self.queue(
+            path,
+            lambda: pytmx.TiledMap(path, image_loader=decode_image_loader),
+            finalize,
+        )
+
+    def update(self, budget_ms: float) -> bool:
+        """Finalizes the decoded assets on the main thread until the
+        time budget runs out.
+
+        Args:
+            budget_ms (float): Maximum time spent on this call, in
+                milliseconds. At least one asset is finalized per call
+                when there is one ready.
+
+        Returns:
+            bool: True when all queued assets are loaded.
+        """
+        deadline = perf_counter() + budget_ms / 1000
+
+        for item in list(self.pending):
+            key, future, finalize = item
+
+            if not future.done():
+                continue
+
+            self.cache[key] = finalize(future.result())
+            self.pending.remove(item)
+            self.completed += 1
+
+            if perf_counter() >= deadline:
+                break
+
+        return self.done
+
+    def wait(self) -> None:
+        """Blocks until every queued asset is loaded, including the ones
+        queued while finalizing others.
+        """
+        while not self.done:
+            wait_futures(
+                [future for _, future, _ in self.pending], return_when=FIRST_COMPLETED
+            )
+            self.update(float("inf"))
+
+    def get(self, key: str) -> Any:
+        return self.cache[key]
+
+    def image(self, path: str, alpha: bool = True) -> Surface:
+        """Returns a loaded image, loading it synchronously when it was
+        not queued before.
+
+        Args:
+            path (str): The image path.
+            alpha (bool, optional): Whether the image has per-pixel
+                alpha. Defaults to True.
+
+        Returns:
+            Surface: The converted image.
+        """
+        if path not in self.cache:
+            surface = load_image(path)
+            self.cache[path] = surface.convert_alpha() if alpha else surface.convert()
+
+        return self.cache[path]
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
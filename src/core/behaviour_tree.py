@@ -0,0 +1,224 @@
+import json
+from time import perf_counter
+from functools import cache
+from collections import Counter, deque
+from typing import Any, Callable, Hashable, Iterable
+
+CONDITIONS: dict[str, Callable[..., bool]] = {}
+ACTIONS: dict[str, Callable[..., bool]] = {}
+
+
+def register_condition(name: str) -> Callable:
+    """Registers a function as a condition usable by the behaviour
+    files. The function receives the entity, the distance to the player
+    and the parameters of the node, and returns whether it holds.
+
+    Args:
+        name (str): The condition name used by the behaviour files.
+    """
+
+    def decorator(function: Callable[..., bool]) -> Callable[..., bool]:
+        CONDITIONS[name] = function
+        return function
+
+    return decorator
+
+
+def register_action(name: str) -> Callable:
+    """Registers a function as an action usable by the behaviour files.
+    The function receives the entity, the distance and the direction to
+    the player, runs every tick while the action is the decision of the
+    entity, and returns False when the decision is no longer valid.
+
+    Args:
+        name (str): The action name used by the behaviour files.
+    """
+
+    def decorator(function: Callable[..., bool]) -> Callable[..., bool]:
+        ACTIONS[name] = function
+        return function
+
+    return decorator
+
+
+class Selector:
+    __slots__ = ("children",)
+
+    def __init__(self, children: list) -> None:
+        self.children = children
+
+    def evaluate(self, entity: Any, distance: float) -> str | bool:
+        for child in self.children:
+            result = child.evaluate(entity, distance)
+
+            if result:
+                return result
+
+        return False
+
+
+class Sequence:
+    __slots__ = ("children",)
+
+    def __init__(self, children: list) -> None:
+        self.children = children
+
+    def evaluate(self, entity: Any, distance: float) -> str | bool:
+        result = True
+
+        for child in self.children:
+            result = child.evaluate(entity, distance)
+
+            if not result:
+                return False
+
+        return result
+
+
+class Condition:
+    __slots__ = ("check", "params")
+
+    def __init__(self, name: str, params: dict[str, Any]) -> None:
+        self.check = CONDITIONS[name]
+        self.params = params
+
+    def evaluate(self, entity: Any, distance: float) -> bool:
+        return self.check(entity, distance, **self.params)
+
+
+class Action:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        if name not in ACTIONS:
+            raise KeyError(f"unknown action: {name}")
+
+        self.name = name
+
+    def evaluate(self, entity: Any, distance: float) -> str:
+        return self.name
+
+
+def build_tree(spec: dict[str, Any]) -> Selector | Sequence | Condition | Action:
+    """Builds a behaviour tree from its description.
+
+    Args:
+        spec (dict[str, Any]): A node, either {"selector": [...]},
+            {"sequence": [...]}, {"condition": name, **params} or
+            {"action": name}.
+
+    Returns:
+        Selector | Sequence | Condition | Action: The root node.
+    """
+    spec = dict(spec)
+
+    if "selector" in spec:
+        return Selector([build_tree(child) for child in spec["selector"]])
+
+    if "sequence" in spec:
+        return Sequence([build_tree(child) for child in spec["sequence"]])
+
+    if "condition" in spec:
+        return Condition(spec.pop("condition"), spec)
+
+    return Action(spec["action"])
+
+
+@cache
+def load_behaviours(path: str) -> dict[str, Selector | Sequence | Condition | Action]:
+    """Loads the behaviour trees of a file, once.
+
+    Args:
+        path (str): The JSON file mapping each entity type to its tree.
+
+    Returns:
+        dict[str, Selector | Sequence | Condition | Action]: The root
+            node of each entity type.
+    """
+    with open(path) as file:
+        return {name: build_tree(spec) for name, spec in json.load(file).items()}
+
+
+class Brain:
+    __slots__ = ("tree", "key", "decision")
+
+    def __init__(self, tree: Selector | Sequence | Condition | Action) -> None:
+        """Holds the cached decision of an entity.
+
+        Args:
+            tree (Selector | Sequence | Condition | Action): The
+                behaviour tree shared by the entities of a type.
+        """
+        self.tree = tree
+        self.key: Hashable = None
+        self.decision: str | None = None
+
+    def invalidate(self) -> None:
+        """Forces a new decision on the next visit of the entity."""
+        self.key = None
+
+    def act(self, entity: Any, distance: float, direction: Any) -> None:
+        """Runs the action of the current decision, idling while the
+        entity has not decided yet.
+
+        Args:
+            entity (Any): The entity owning the brain.
+            distance (float): The distance to the player.
+            direction (Any): The direction to the player.
+        """
+        if not ACTIONS[self.decision or "idle"](entity, distance, direction):
+            self.invalidate()
+
+
+class BehaviourScheduler:
+    def __init__(self, budget_ms: float) -> None:
+        """Evaluates the behaviour trees of the entities whose inputs
+        changed, visiting the entities in turns across ticks to stay
+        under a time budget.
+
+        Args:
+            budget_ms (float): Maximum time spent per tick, in
+                milliseconds. At least one entity is visited per tick.
+        """
+        self.budget = budget_ms / 1000
+        self.turn = deque()
+        self.stats = Counter()
+
+    def update(self, entities: Iterable) -> None:
+        """Continues the current turn over the entities, evaluating
+        the ones whose decision key changed, until the budget runs out.
+        A new turn starts once every entity has been visited.
+
+        Args:
+            entities (Iterable): Entities with a `brain` and the
+                `get_decision_key` and `get_player_distance_direction`
+                methods.
+        """
+        deadline = perf_counter() + self.budget
+
+        if not self.turn:
+            self.turn.extend(entities)
+
+        visited = 0
+
+        while self.turn and (visited == 0 or perf_counter() < deadline):
+            entity = self.turn.popleft()
+            visited += 1
+
+            if not entity.alive():
+                continue
+
+            brain = entity.brain
+            key = entity.get_decision_key()
+
+            if key == brain.key:
+                continue
+
+            distance, _ = entity.get_player_distance_direction()
+            decision = brain.tree.evaluate(entity, distance)
+
+            brain.key = key
+            brain.decision = decision if isinstance(decision, str) else None
+            self.stats["evaluated"] += 1
+
+        self.stats["visited"] += visited
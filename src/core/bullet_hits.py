@@ -0,0 +1,155 @@
+from typing import Iterable, Sequence
+
+import numpy as np
+from pygame.rect import Rect
+from pygame.math import Vector2
+from pygame.sprite import Sprite
+from pygame.surface import Surface
+
+from src.core.grid import segment_rect_time
+from src.core.mapping_group import MappingGroup
+from src.core.mask_cache import get_mask
+
+
+def get_bounds(rects: Iterable[Rect], size: tuple[int, int]) -> np.ndarray:
+    """Builds the left, top, right and bottom edges of rects inflated
+    by a size, so they can be tested against the path of a center.
+
+    Args:
+        rects (Iterable[Rect]): The rects.
+        size (tuple[int, int]): The size to inflate them by.
+
+    Returns:
+        np.ndarray: An array of shape (n, 4).
+    """
+    bounds = np.array([rect.inflate(size) for rect in rects], dtype=np.float64).reshape(
+        -1, 4
+    )
+    bounds[:, 2:] += bounds[:, :2]
+
+    return bounds
+
+
+class BulletHitTester:
+    def __init__(self, bullet_surface: Surface, obstacles: MappingGroup) -> None:
+        """Finds the first sprite hit by each bullet during a step, for
+        every bullet at once.
+
+        The obstacles are found by sweeping each bullet through their
+        grid. The targets move every step, so their bounds are tested
+        against the paths of all the bullets at once with NumPy instead.
+        Only the overlapping pairs go on to the exact tests: the
+        obstacle hitboxes, and the masks of the targets, which come from
+        the per-frame mask cache. Every bullet shares the same surface,
+        so its mask is built once.
+
+        Args:
+            bullet_surface (Surface): The surface of every bullet.
+            obstacles (MappingGroup): The obstacles, with a `hitbox`
+                inside their rect.
+        """
+        self.bullet_mask = get_mask(bullet_surface)
+        self.bullet_size = bullet_surface.get_size()
+        self.bullet_radius = max(self.bullet_size) / 2
+
+        self.obstacles = obstacles
+
+    def test(
+        self, bullets: Sequence[Sprite], targets: Sequence[Sprite]
+    ) -> list[tuple[Sprite, Sprite]]:
+        """Finds the first obstacle or target hit by each bullet moving
+        from `prev_pos` to `pos`.
+
+        Args:
+            bullets (Sequence[Sprite]): The moving bullets.
+            targets (Sequence[Sprite]): The entities that may be hit,
+                with a `mask`.
+
+        Returns:
+            list[tuple[Sprite, Sprite]]: The bullets that hit something,
+                with the sprite they hit, in the order of `bullets`.
+        """
+        if not bullets:
+            return []
+
+        paths = np.array(
+            [(*bullet.prev_pos, *bullet.pos) for bullet in bullets], dtype=np.float64
+        )
+        lows = np.minimum(paths[:, :2], paths[:, 2:])
+        highs = np.maximum(paths[:, :2], paths[:, 2:])
+
+        first_hits: dict[int, tuple[float, Sprite]] = {}
+
+        for index, bullet in enumerate(bullets):
+            hit = self.obstacles.sweep(
+                bullet.prev_pos,
+                bullet.pos,
+                lambda obstacle, start, end: self.obstacle_hit_time(
+                    start, end, obstacle
+                ),
+                self.bullet_radius,
+            )
+
+            if hit is not None:
+                first_hits[index] = (hit[1], hit[0])
+
+        bounds = get_bounds((target.rect for target in targets), self.bullet_size)
+        overlaps = (
+            (lows[:, None, 0] <= bounds[None, :, 2])
+            & (highs[:, None, 0] >= bounds[None, :, 0])
+            & (lows[:, None, 1] <= bounds[None, :, 3])
+            & (highs[:, None, 1] >= bounds[None, :, 1])
+        )
+
+        for index, target_index in zip(*np.nonzero(overlaps)):
+            bullet, target = bullets[index], targets[target_index]
+            t = self.mask_hit_time(bullet.prev_pos, bullet.pos, target)
+
+            if t is not None and (index not in first_hits or t < first_hits[index][0]):
+                first_hits[index] = (t, target)
+
+        return [(bullets[index], first_hits[index][1]) for index in sorted(first_hits)]
+
+    def obstacle_hit_time(
+        self, start: Vector2, end: Vector2, obstacle: Sprite
+    ) -> float | None:
+        return segment_rect_time(start, end, obstacle.hitbox.inflate(self.bullet_size))
+
+    def mask_hit_time(
+        self, start: Vector2, end: Vector2, target: Sprite
+    ) -> float | None:
+        """Calculates when a bullet moving from `start` to `end` first
+        overlaps the mask of the target.
+
+        Args:
+            start (Vector2): The bullet center at the start of the step.
+            end (Vector2): The bullet center at the end of the step.
+            target (Sprite): The sprite that may be hit.
+
+        Returns:
+            float | None: The segment parameter, between 0 and 1, of
+                the hit, or None on a miss.
+        """
+        width, height = self.bullet_size
+        t_enter = segment_rect_time(start, end, target.rect.inflate(self.bullet_size))
+
+        if t_enter is None:
+            return None
+
+        length = start.distance_to(end)
+        step = width / 2 / length if length else 1
+        t = t_enter
+
+        while t <= 1:
+            center = start.lerp(end, t)
+            offset = (
+                round(center.x - width / 2 - target.rect.x),
+                round(center.y - height / 2 - target.rect.y),
+            )
+
+            if target.mask.overlap(self.bullet_mask, offset):
+                return t
+
+            t += step
+
+        return None
@@ -0,0 +1,101 @@
+"""Compares loading the animation frames from the loose images and from
+the asset bundle.
+
+Each run loads the frames in a new process, so both start with empty
+caches. Build the bundle first, then run from the project root:
+
+    $ python -m src.core.asset_bundle
+    $ python -m src.core.bundle_benchmark [runs]
+"""
+
+import os
+import sys
+import json
+import resource
+import subprocess
+from time import perf_counter
+
+import pygame
+
+from src.core.asset_loader import AssetLoader
+from src.core.asset_bundle import has_bundle
+from settings import ASSET_BUNDLE_DIR, ASSET_LOADER_WORKERS, PATHS
+
+
+def resident_memory() -> int:
+    """Returns the resident memory of the process, in bytes, or its
+    peak when the current value is not available.
+
+    Returns:
+        int: The resident memory.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load(bundle_dir: str) -> dict[str, float]:
+    """Loads every animation with the asset loader, as the game does.
+
+    Args:
+        bundle_dir (str): The bundle directory. A missing directory
+            loads the loose images.
+
+    Returns:
+        dict[str, float]: The load time, in seconds, and the resident
+            memory added by the frames, in bytes.
+    """
+    loader = AssetLoader(ASSET_LOADER_WORKERS)
+    before = resident_memory()
+    start = perf_counter()
+
+    loader.queue_animations(PATHS.values(), bundle_dir)
+
+    loader.wait()
+
+    seconds = perf_counter() - start
+    loader.shutdown()
+
+    return {"seconds": seconds, "memory": resident_memory() - before}
+
+
+def run(mode: str) -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-m", "src.core.bundle_benchmark", "--child", mode],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    if sys.argv[1:2] == ["--child"]:
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+        bundle_dir = ASSET_BUNDLE_DIR if sys.argv[2] == "bundle" else ""
+        print(json.dumps(load(bundle_dir)))
+        sys.exit()
+
+    if not has_bundle(ASSET_BUNDLE_DIR):
+        sys.exit(f"No asset bundle in {ASSET_BUNDLE_DIR}, build it first")
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Best of {runs} runs")
+    print(f"{'source':<8} {'load (ms)':>10} {'memory (MiB)':>13}")
+
+    for mode in ("loose", "bundle"):
+        results = [run(mode) for _ in range(runs)]
+        seconds = min(result["seconds"] for result in results)
+        memory = min(result["memory"] for result in results)
+
+        print(f"{mode:<8} {seconds * 1000:>10.1f} {memory / 2**20:>13.1f}")
@@ -0,0 +1,92 @@
+from pygame.rect import Rect
+
+from src.core.mapping_group import MappingGroup
+
+
+class CollisionResolver:
+    def __init__(self, obstacles: MappingGroup) -> None:
+        """Moves entities and pushes them out of the obstacles, one
+        group at a time.
+
+        Args:
+            obstacles (MappingGroup): The static obstacles.
+        """
+        self.obstacles = obstacles
+
+    def resolve(self, group: MappingGroup, dt: float) -> None:
+        """Moves every entity of a group along its direction, resolving
+        the horizontal and then the vertical axis against the obstacles
+        found by a single query covering the whole movement.
+
+        Args:
+            group (MappingGroup): The moving entities.
+            dt (float): The time delta.
+        """
+        for entity in group.sprites():
+            if not entity.direction:
+                continue
+
+            entity.direction.normalize_ip()
+
+            pos = entity.pos
+            hitbox = entity.hitbox
+            dx = entity.direction.x * entity.speed * dt
+            dy = entity.direction.y * entity.speed * dt
+
+            area = hitbox.move(
+                round(pos.x + dx) - hitbox.centerx, round(pos.y + dy) - hitbox.centery
+            )
+            area.union_ip(hitbox)
+
+            obstacles = [
+                obstacle.hitbox for obstacle in self.obstacles.query_rect(area)
+            ]
+
+            if dx:
+                pos.x += dx
+                hitbox.centerx = round(pos.x)
+
+                if self.__resolve_horizontal(hitbox, dx, obstacles):
+                    pos.x = hitbox.centerx
+
+            if dy:
+                pos.y += dy
+                hitbox.centery = round(pos.y)
+
+                if self.__resolve_vertical(hitbox, dy, obstacles):
+                    pos.y = hitbox.centery
+
+            entity.rect.center = hitbox.center
+            group.refresh(entity)
+
+    def __resolve_horizontal(
+        self, hitbox: Rect, dx: float, obstacles: list[Rect]
+    ) -> bool:
+        collided = False
+
+        for obstacle in obstacles:
+            if obstacle.colliderect(hitbox):
+                if dx > 0:
+                    hitbox.right = obstacle.left
+                else:
+                    hitbox.left = obstacle.right
+
+                collided = True
+
+        return collided
+
+    def __resolve_vertical(
+        self, hitbox: Rect, dy: float, obstacles: list[Rect]
+    ) -> bool:
+        collided = False
+
+        for obstacle in obstacles:
+            if obstacle.colliderect(hitbox):
+                if dy < 0:
+                    hitbox.top = obstacle.bottom
+                else:
+                    hitbox.bottom = obstacle.top
+
+                collided = True
+
+        return collided
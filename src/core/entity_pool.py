@@ -0,0 +1,67 @@
+from typing import Callable
+
+from pygame.sprite import AbstractGroup
+
+from src.sprites.entity import Entity
+
+
+class EntityPool:
+    def __init__(
+        self,
+        factory: Callable[[tuple[int, int]], Entity],
+        *groups: AbstractGroup,
+    ) -> None:
+        """Keeps dead entities to reuse them instead of creating new
+        ones, skipping the asset and event setup done by
+        `Entity.__init__`.
+
+        Args:
+            factory (Callable[[tuple[int, int]], Entity]): Creates a new
+                entity at a position, already added to `groups`.
+            *groups (AbstractGroup): The groups a reused entity is
+                added back to.
+        """
+        self.factory = factory
+        self.groups = groups
+        self.free: list[Entity] = []
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def acquire(self, position: tuple[int, int]) -> Entity:
+        """Returns an entity at the given position, reusing a free one
+        when available.
+
+        Args:
+            position (tuple[int, int]): The center of the entity.
+
+        Returns:
+            Entity: The entity, alive and added to the pool groups.
+        """
+        if not self.free:
+            return self.factory(position)
+
+        entity = self.free.pop()
+        entity.reset(position)
+        entity.add(*self.groups)
+
+        return entity
+
+    def release(self, entity: Entity) -> None:
+        """Gives an entity back to the pool, removing it from its
+        groups.
+
+        Args:
+            entity (Entity): The entity to release.
+        """
+        entity.kill()
+        self.free.append(entity)
+
+    def prewarm(self, count: int) -> None:
+        """Creates free entities ahead of time.
+
+        Args:
+            count (int): How many entities to create.
+        """
+        for _ in range(count):
+            self.release(self.factory((0, 0)))
@@ -0,0 +1,112 @@
+from time import perf_counter, sleep
+from collections import deque
+
+
+class FramePacer:
+    def __init__(
+        self,
+        tick_rate: int,
+        frame_rate: int = 0,
+        max_steps: int = 5,
+        busy_wait_ms: float = 0,
+    ) -> None:
+        """Fixed-step simulation clock with render frame pacing.
+
+        Args:
+            tick_rate (int): Simulation steps per second.
+            frame_rate (int, optional): Rendered frames per second, 0
+                disables the frame limit. Defaults to 0.
+            max_steps (int, optional): Maximum simulation steps run in
+                a single frame. Time beyond that is dropped, so the
+                game slows down instead of spiralling after a long
+                stall. Defaults to 5.
+            busy_wait_ms (float, optional): The last milliseconds of
+                each frame wait are spent spinning instead of sleeping,
+                trading CPU for precise pacing. Defaults to 0.
+        """
+        self.step = 1 / tick_rate
+        self.frame_time = 1 / frame_rate if frame_rate else 0
+        self.max_steps = max_steps
+        self.busy_wait = busy_wait_ms / 1000
+
+        self.accumulator = 0.0
+        self.last_time = perf_counter()
+        self.next_frame = self.last_time
+        self.frame_times = deque(maxlen=60)
+
+    @property
+    def alpha(self) -> float:
+        """How far the current frame is between the last two
+        simulation steps, used to interpolate rendering.
+
+        Returns:
+            float: A value between 0 and 1.
+        """
+        return self.accumulator / self.step
+
+    @property
+    def fps(self) -> float:
+        if not self.frame_times:
+            return 0.0
+
+        return len(self.frame_times) / sum(self.frame_times)
+
+    def begin_frame(self) -> int:
+        """Advances the clock and returns how many simulation steps
+        must run before rendering this frame.
+
+        Returns:
+            int: The number of fixed steps to run.
+        """
+        now = perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+
+        if elapsed > 0:
+            self.frame_times.append(elapsed)
+
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+
+        return steps
+
+    def idle_time(self) -> float:
+        """Time left before the next frame should start, excluding the
+        busy-wait, which can be used for background work.
+
+        Returns:
+            float: The idle time in seconds, 0 without a frame limit.
+        """
+        if not self.frame_time:
+            return 0.0
+
+        deadline = self.next_frame + self.frame_time - self.busy_wait
+        return max(0.0, deadline - perf_counter())
+
+    def wait(self) -> None:
+        """Waits until the next frame should start, sleeping for most
+        of the remaining time and busy-waiting the rest.
+        """
+        if not self.frame_time:
+            return
+
+        self.next_frame += self.frame_time
+        now = perf_counter()
+
+        if self.next_frame < now:
+            self.next_frame = now
+            return
+
+        remaining = self.next_frame - now - self.busy_wait
+
+        if remaining > 0:
+            sleep(remaining)
+
+        while perf_counter() < self.next_frame:
+            pass
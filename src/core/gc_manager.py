@@ -0,0 +1,80 @@
+import gc
+from time import perf_counter
+from collections import Counter
+
+
+class GCManager:
+    def __init__(
+        self,
+        thresholds: tuple[int, int, int],
+        idle_thresholds: tuple[int, int, int],
+    ) -> None:
+        """Moves the garbage collection out of the frames and into the
+        time the game would otherwise spend waiting for the next frame.
+
+        The automatic collection thresholds are raised to `thresholds`,
+        so it only runs as a safety net, and each generation is
+        collected during idle time once its count reaches
+        `idle_thresholds`, if its last duration fits in that time.
+
+        Args:
+            thresholds (tuple[int, int, int]): The thresholds of the
+                automatic collection, see `gc.set_threshold`.
+            idle_thresholds (tuple[int, int, int]): The counts, as
+                returned by `gc.get_count`, that make a generation due
+                for an idle collection.
+        """
+        self.thresholds = thresholds
+        self.idle_thresholds = idle_thresholds
+
+        self.previous_thresholds = gc.get_threshold()
+        self.durations = [0.0, 0.0, 0.0]
+        self.stats = Counter()
+
+    def freeze(self) -> None:
+        """Collects the garbage left by the loading and moves every
+        object still alive, like the map, the assets and the obstacles,
+        to the permanent generation, so later collections skip them.
+        Then applies the collection thresholds.
+        """
+        self.previous_thresholds = gc.get_threshold()
+
+        gc.collect()
+        gc.freeze()
+        gc.set_threshold(*self.thresholds)
+
+    def restore(self) -> None:
+        """Moves the frozen objects back to the oldest generation and
+        restores the previous collection thresholds.
+        """
+        gc.unfreeze()
+        gc.set_threshold(*self.previous_thresholds)
+
+    def collect_idle(self, idle_time: float) -> None:
+        """Collects the oldest due generation that is expected to
+        finish within the idle time.
+
+        Args:
+            idle_time (float): The time left before the next frame, in
+                seconds.
+        """
+        counts = gc.get_count()
+
+        for generation in (2, 1, 0):
+            if counts[generation] < self.idle_thresholds[generation]:
+                continue
+
+            if self.durations[generation] > idle_time:
+                self.stats[f"skipped gen {generation}"] += 1
+                continue
+
+            start = perf_counter()
+            gc.collect(generation)
+            duration = perf_counter() - start
+
+            # Smoothed, so a single slow collection doesn't postpone
+            # that generation for too long.
+            previous = self.durations[generation] or duration
+            self.durations[generation] = previous + (duration - previous) / 4
+            self.stats[f"collected gen {generation}"] += 1
+            return
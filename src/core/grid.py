@@ -0,0 +1,83 @@
+from math import inf
+from typing import Iterator
+
+from pygame.rect import Rect
+
+
+def traverse_cells(
+    start: tuple[float, float], end: tuple[float, float], cell_size: int
+) -> Iterator[tuple[tuple[int, int], float, float]]:
+    """Visits, in order, every grid cell crossed by a segment, using
+    the DDA traversal from Amanatides and Woo.
+
+    Args:
+        start (tuple[float, float]): The segment start position.
+        end (tuple[float, float]): The segment end position.
+        cell_size (int): The size of the grid cells.
+
+    Yields:
+        tuple[tuple[int, int], float, float]: The cell position and the
+            segment parameters, between 0 and 1, where the segment
+            enters and leaves the cell.
+    """
+    x0, y0 = start
+    x1, y1 = end
+    dx, dy = x1 - x0, y1 - y0
+
+    cell_x, cell_y = int(x0 // cell_size), int(y0 // cell_size)
+    end_cell = int(x1 // cell_size), int(y1 // cell_size)
+
+    step_x = (dx > 0) - (dx < 0)
+    step_y = (dy > 0) - (dy < 0)
+
+    delta_x = cell_size / abs(dx) if dx else inf
+    delta_y = cell_size / abs(dy) if dy else inf
+
+    next_x = ((cell_x + (dx > 0)) * cell_size - x0) / dx if dx else inf
+    next_y = ((cell_y + (dy > 0)) * cell_size - y0) / dy if dy else inf
+
+    t_enter = 0.0
+
+    while True:
+        t_exit = min(next_x, next_y, 1.0)
+        yield (cell_x, cell_y), t_enter, t_exit
+
+        if (cell_x, cell_y) == end_cell or t_exit >= 1.0:
+            return
+
+        if next_x < next_y:
+            cell_x += step_x
+            t_enter = next_x
+            next_x += delta_x
+        else:
+            cell_y += step_y
+            t_enter = next_y
+            next_y += delta_y
+
+
+def segment_rect_time(
+    start: tuple[float, float], end: tuple[float, float], rect: Rect
+) -> float | None:
+    """Calculates where a segment enters a rectangle.
+
+    Args:
+        start (tuple[float, float]): The segment start position.
+        end (tuple[float, float]): The segment end position.
+        rect (Rect): The rectangle to test.
+
+    Returns:
+        float | None: The segment parameter, between 0 and 1, of the
+            entry point, or None if the segment misses the rectangle.
+    """
+    clipped = rect.clipline(start, end)
+
+    if not clipped:
+        return None
+
+    length = max(abs(end[0] - start[0]), abs(end[1] - start[1]))
+
+    if length == 0:
+        return 0.0
+
+    entry = clipped[0]
+    return max(abs(entry[0] - start[0]), abs(entry[1] - start[1])) / length
@@ -0,0 +1,104 @@
+from collections import Counter
+from typing import Iterable
+
+from src.core.grid import traverse_cells
+
+
+class LineOfSight:
+    def __init__(
+        self, obstacles: Iterable, tile_size: int, max_entries: int = 65536
+    ) -> None:
+        """Answers visibility queries over a grid of the static
+        obstacles, caching the result for each pair of tiles.
+
+        A tile blocks the sight when the hitbox of an obstacle covers
+        its center. The obstacles must not move after the grid is
+        built.
+
+        Args:
+            obstacles (Iterable): Sprites with a `hitbox`.
+            tile_size (int): The size of the grid tiles.
+            max_entries (int, optional): Cached pairs kept before the
+                cache is cleared. Defaults to 65536.
+        """
+        self.tile_size = tile_size
+        self.max_entries = max_entries
+
+        self.blocked = self.build_grid(obstacles)
+        self.cache: dict[tuple[tuple[int, int], tuple[int, int]], bool] = {}
+        self.stats = Counter()
+
+    def build_grid(self, obstacles: Iterable) -> set[tuple[int, int]]:
+        """Finds the tiles whose center is covered by an obstacle.
+
+        Args:
+            obstacles (Iterable): Sprites with a `hitbox`.
+
+        Returns:
+            set[tuple[int, int]]: The blocking tiles.
+        """
+        size = self.tile_size
+        blocked = set()
+
+        for obstacle in obstacles:
+            hitbox = obstacle.hitbox
+
+            for x in range(hitbox.left // size, (hitbox.right - 1) // size + 1):
+                for y in range(hitbox.top // size, (hitbox.bottom - 1) // size + 1):
+                    if hitbox.collidepoint(x * size + size // 2, y * size + size // 2):
+                        blocked.add((x, y))
+
+        return blocked
+
+    def get_tile(self, position: tuple[float, float]) -> tuple[int, int]:
+        return int(position[0] // self.tile_size), int(position[1] // self.tile_size)
+
+    def is_visible(self, start: tuple[float, float], end: tuple[float, float]) -> bool:
+        """Checks whether no obstacle stands between two positions.
+
+        The answer is shared by every pair of positions in the same two
+        tiles, in either order.
+
+        Args:
+            start (tuple[float, float]): The position looking.
+            end (tuple[float, float]): The position looked at.
+
+        Returns:
+            bool: Whether the line between both tiles is clear.
+        """
+        key = tuple(sorted((self.get_tile(start), self.get_tile(end))))
+
+        if key in self.cache:
+            self.stats["hits"] += 1
+            return self.cache[key]
+
+        if len(self.cache) >= self.max_entries:
+            self.cache.clear()
+
+        self.stats["raycasts"] += 1
+        self.cache[key] = visible = self.raycast(*key)
+
+        return visible
+
+    def raycast(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        """Walks the tiles crossed by the line between two tile centers,
+        ignoring both end tiles.
+
+        Args:
+            start (tuple[int, int]): The first tile.
+            end (tuple[int, int]): The second tile.
+
+        Returns:
+            bool: Whether none of the crossed tiles is blocking.
+        """
+        half = self.tile_size / 2
+
+        for tile, _, _ in traverse_cells(
+            (start[0] * self.tile_size + half, start[1] * self.tile_size + half),
+            (end[0] * self.tile_size + half, end[1] * self.tile_size + half),
+            self.tile_size,
+        ):
+            if tile in self.blocked and tile != start and tile != end:
+                return False
+
+        return True
@@ -1,16 +1,23 @@
-from typing import Any
+from math import ceil
+from typing import Any, Callable
 from collections import defaultdict
 
 import numpy as np
+from pygame.rect import Rect
+from pygame.math import Vector2
 from pygame.sprite import Group, Sprite
 
+from src.core.grid import segment_rect_time, traverse_cells
+
 
 class MappingGroup(Group):
     def __init__(self, tile_size: int, *sprites) -> None:
-        super().__init__(*sprites)
-
         self.tile_size = tile_size
         self.position_map = defaultdict(list)
+        self.sprite_tiles = {}
+        self.bounds: tuple[int, int, int, int] | None = None
+
+        super().__init__(*sprites)
 
     def add_internal(self, sprite: Any, layer: None = None) -> None:
         """Adds a sprite to the internal list of sprites and updates
@@ -22,8 +29,12 @@ class MappingGroup(Group):
                 Defaults to None.
         """
         if not self.has_internal(sprite):
-            for pos in self._get_all_tiles_from_sprite(sprite):
-                self.position_map[tuple(pos)].append(sprite)
+            tiles = self._get_all_tiles_from_sprite(sprite)
+            self.sprite_tiles[sprite] = tiles
+            self._extend_bounds(tiles)
+
+            for pos in tiles:
+                self.position_map[pos].append(sprite)
 
         return super().add_internal(sprite, layer)
 
@@ -35,8 +46,8 @@ class MappingGroup(Group):
             sprite (Any): The sprite to be removed.
         """
         if self.has_internal(sprite):
-            for pos in self._get_all_tiles_from_sprite(sprite):
-                self.position_map[tuple(pos)].remove(sprite)
+            for pos in self.sprite_tiles.pop(sprite):
+                self.position_map[pos].remove(sprite)
 
         return super().remove_internal(sprite)
 
@@ -48,49 +59,284 @@ class MappingGroup(Group):
             **kwargs: Additional keyword arguments.
         """
         for sprite in self.sprites():
-            old_sprite_pos = self._get_all_tiles_from_sprite(sprite)
             sprite.update(*args, **kwargs)
-            new_sprite_pos = self._get_all_tiles_from_sprite(sprite)
 
-            if tuple(new_sprite_pos[0]) != tuple(old_sprite_pos[0]):
-                for old_pos in old_sprite_pos:
-                    self.position_map[tuple(old_pos)].remove(sprite)
+            if self.has_internal(sprite):
+                self.refresh(sprite)
+
+    def refresh(self, sprite: Any) -> None:
+        """Moves a sprite to the tiles covered by its current rect in
+        the position map.
+
+        Args:
+            sprite (Any): The sprite that may have moved.
+        """
+        old_tiles = self.sprite_tiles[sprite]
+        new_tiles = self._get_all_tiles_from_sprite(sprite)
+
+        if new_tiles == old_tiles:
+            return
 
-                for new_pos in new_sprite_pos:
-                    self.position_map[tuple(new_pos)].append(sprite)
+        for old_pos in old_tiles:
+            self.position_map[old_pos].remove(sprite)
 
-    def near_sprites(self, position: tuple[int, int]) -> list[Sprite]:
-        """Returns a list of Sprite objects that are near the given
-        position.
+        for new_pos in new_tiles:
+            self.position_map[new_pos].append(sprite)
+
+        self.sprite_tiles[sprite] = new_tiles
+        self._extend_bounds(new_tiles)
+
+    def _extend_bounds(self, tiles: list[tuple[int, int]]) -> None:
+        """Grows the bounds of the occupied cells to cover some tiles.
+        The bounds never shrink, so they may include cells emptied
+        since.
 
         Args:
-            position (tuple[int, int]): The position to check for
-                nearby sprites.
+            tiles (list[tuple[int, int]]): The tiles of a sprite, from
+                the top left to the bottom right one.
+        """
+        if not tiles:
+            return
+
+        (left, top), (right, bottom) = tiles[0], tiles[-1]
+
+        if self.bounds is not None:
+            min_x, min_y, max_x, max_y = self.bounds
+            left, top = min(left, min_x), min(top, min_y)
+            right, bottom = max(right, max_x), max(bottom, max_y)
+
+        self.bounds = (left, top, right, bottom)
+
+    def query_rect(self, rect: Rect, exact: bool = True) -> list[Sprite]:
+        """Returns the sprites in the cells covered by a rectangle,
+        without duplicates.
+
+        Args:
+            rect (Rect): The area to query, e.g. the camera viewport.
+            exact (bool, optional): Whether to keep only the sprites
+                whose rect collides with the queried one. Defaults to
+                True.
 
         Returns:
-            list[Sprite]: A list of Sprite objects that are near the
-                given position.
+            list[Sprite]: The sprites found.
         """
-        tile_pos = self._get_tile_position(*position)
-        returned_sprites = []
+        left, top = self._get_tile_position(*rect.topleft)
+        right, bottom = self._get_tile_position(rect.right - 1, rect.bottom - 1)
+
+        sprites = self._sprites_in_cells(
+            (x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)
+        )
 
+        if not exact:
+            return sprites
+
+        return [sprite for sprite in sprites if rect.colliderect(sprite.rect)]
+
+    def k_nearest(
+        self,
+        position: tuple[float, float],
+        k: int,
+        max_radius: float | None = None,
+    ) -> list[Sprite]:
+        """Returns the `k` sprites closest to a position, searching the
+        cells in growing rings around it.
+
+        Args:
+            position (tuple[float, float]): The center of the query.
+            k (int): The number of sprites to return.
+            max_radius (float | None, optional): Sprites farther than
+                this are ignored. Defaults to None.
+
+        Returns:
+            list[Sprite]: Up to `k` sprites, closest first.
+        """
+        if k <= 0 or not self.sprite_tiles:
+            return []
+
+        center_x, center_y = self._get_tile_position(*position)
+        max_ring = self._get_max_ring(center_x, center_y)
+
+        if max_radius is not None:
+            max_ring = min(max_ring, int(max_radius // self.tile_size) + 1)
+
+        sprites = {}
+
+        for ring in range(max_ring + 1):
+            sprites.update(
+                dict.fromkeys(
+                    self._sprites_in_cells(
+                        self._get_ring_cells(center_x, center_y, ring)
+                    )
+                )
+            )
+
+            # Any sprite outside the rings seen so far is farther than
+            # `ring * tile_size`, so the search can stop once the k
+            # closest candidates are all within that distance.
+            if len(sprites) >= k:
+                candidates = list(sprites)
+                distances = self._get_distances(candidates, position)
+
+                if np.partition(distances, k - 1)[k - 1] <= ring * self.tile_size:
+                    break
+        else:
+            candidates = list(sprites)
+            distances = self._get_distances(candidates, position)
+
+        if not candidates:
+            return []
+
+        order = np.argsort(distances, kind="stable")
+
+        if max_radius is not None:
+            order = order[distances[order] <= max_radius]
+
+        return [candidates[i] for i in order[:k]]
+
+    def sweep(
+        self,
+        start: tuple[float, float],
+        end: tuple[float, float],
+        hit_time: Callable[[Sprite, Vector2, Vector2], float | None] | None = None,
+        radius: float = 0,
+    ) -> tuple[Sprite, float] | None:
+        """Finds the first sprite hit by a segment, visiting only the
+        cells crossed by it and, for a box moving along the segment,
+        the cells it overlaps around them.
+
+        Args:
+            start (tuple[float, float]): The segment start position.
+            end (tuple[float, float]): The segment end position.
+            hit_time (Callable[[Sprite, Vector2, Vector2], float | None]
+                | None, optional): Function returning the segment
+                parameter, between 0 and 1, where the segment hits the
+                given sprite, or None on a miss. Defaults to a test
+                against the sprite rect inflated by `radius`.
+            radius (float, optional): Half the size of the box moving
+                along the segment, e.g. a bullet. `hit_time` must not
+                find hits farther than this from the sprite rects.
+                Defaults to 0.
+
+        Returns:
+            tuple[Sprite, float] | None: The first sprite hit and the
+                segment parameter of the hit, or None if nothing is
+                hit.
+        """
+        start, end = Vector2(start), Vector2(end)
+
+        if hit_time is None:
+            hit_time = lambda sprite, start, end: segment_rect_time(
+                start, end, sprite.rect.inflate(radius * 2, radius * 2)
+            )
+
+        # A sprite hit when the center is in a cell lies at most this
+        # many cells away from it.
+        reach = ceil(radius / self.tile_size)
         offsets = [
-            (0, 0),
-            (1, 0),
-            (-1, 0),
-            (0, 1),
-            (0, -1),
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
+            (x, y) for x in range(-reach, reach + 1) for y in range(-reach, reach + 1)
         ]
 
-        for offset in offsets:
-            near_pos = tile_pos[0] + offset[0], tile_pos[1] + offset[1]
-            returned_sprites.extend(self.position_map[near_pos])
+        checked = set()
+        first_hit = None
+
+        for (cell_x, cell_y), t_enter, _ in traverse_cells(start, end, self.tile_size):
+            if first_hit is not None and t_enter > first_hit[1]:
+                break
+
+            for sprite in self._sprites_in_cells(
+                (cell_x + x, cell_y + y) for x, y in offsets
+            ):
+                if sprite in checked:
+                    continue
+
+                checked.add(sprite)
+                t = hit_time(sprite, start, end)
+
+                if t is not None and (first_hit is None or t < first_hit[1]):
+                    first_hit = (sprite, t)
+
+        return first_hit
+
+    def _sprites_in_cells(self, cells) -> list[Sprite]:
+        """Collects the sprites of the given cells, without duplicates.
+
+        Args:
+            cells: An iterable of cell positions.
+
+        Returns:
+            list[Sprite]: The sprites found, in the cells order.
+        """
+        sprites = {}
+
+        for cell in cells:
+            sprites.update(dict.fromkeys(self.position_map.get(cell, ())))
+
+        return list(sprites)
+
+    def _get_ring_cells(
+        self, center_x: int, center_y: int, ring: int
+    ) -> list[tuple[int, int]]:
+        """Returns the cells at exactly `ring` cells away from a center
+        cell.
+
+        Args:
+            center_x (int): The center cell x position.
+            center_y (int): The center cell y position.
+            ring (int): The distance, in cells, of the ring.
+
+        Returns:
+            list[tuple[int, int]]: The cells of the ring.
+        """
+        if ring == 0:
+            return [(center_x, center_y)]
+
+        cells = []
+
+        for offset in range(-ring, ring + 1):
+            cells.append((center_x + offset, center_y - ring))
+            cells.append((center_x + offset, center_y + ring))
+
+        for offset in range(-ring + 1, ring):
+            cells.append((center_x - ring, center_y + offset))
+            cells.append((center_x + ring, center_y + offset))
+
+        return cells
+
+    def _get_max_ring(self, center_x: int, center_y: int) -> int:
+        """Returns how many rings are needed around a cell to cover the
+        bounds of the occupied cells.
+
+        Args:
+            center_x (int): The center cell x position.
+            center_y (int): The center cell y position.
+
+        Returns:
+            int: The number of rings.
+        """
+        left, top, right, bottom = self.bounds
+
+        return max(
+            center_x - left, right - center_x, center_y - top, bottom - center_y, 0
+        )
+
+    def _get_distances(
+        self, sprites: list[Sprite], position: tuple[float, float]
+    ) -> np.ndarray:
+        """Computes the distance between each sprite center and a
+        position in a single vectorized operation.
+
+        Args:
+            sprites (list[Sprite]): The sprites to measure.
+            position (tuple[float, float]): The reference position.
 
-        return returned_sprites
+        Returns:
+            np.ndarray: The distances, in the order of `sprites`.
+        """
+        centers = np.array(
+            [sprite.rect.center for sprite in sprites], dtype=float
+        ).reshape(-1, 2)
+
+        return np.hypot(centers[:, 0] - position[0], centers[:, 1] - position[1])
 
     def _get_all_tiles_from_sprite(self, sprite: Any) -> list[tuple[int, int]]:
         """Retrieves all the tiles from a given sprite.
@@ -103,22 +349,13 @@ class MappingGroup(Group):
                 position of each tile.
 
         """
-        top_sprite_tile = self._get_tile_position(*sprite.rect.topleft)
-        tiles_range = (
-            (sprite.rect.bottomright[0] - sprite.rect.topleft[0]) // self.tile_size,
-            (sprite.rect.bottomright[1] - sprite.rect.topleft[1]) // self.tile_size,
-        )
-
-        y_pts = np.arange(
-            top_sprite_tile[1], top_sprite_tile[1] + tiles_range[1] + 1, 1
+        left, top = self._get_tile_position(*sprite.rect.topleft)
+        right, bottom = self._get_tile_position(
+            max(sprite.rect.right - 1, sprite.rect.left),
+            max(sprite.rect.bottom - 1, sprite.rect.top),
         )
-        x_pts = np.arange(
-            top_sprite_tile[0], top_sprite_tile[0] + tiles_range[0] + 1, 1
-        )
-
-        X2D, Y2D = np.meshgrid(y_pts, x_pts)
 
-        return np.column_stack((Y2D.ravel(), X2D.ravel()))
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
 
     def _get_tile_position(self, x: int, y: int) -> tuple[int, int]:
         """Returns the position of a tile based on the given x and y
@@ -132,4 +369,4 @@ class MappingGroup(Group):
             tuple[int, int]: The position of the tile as a tuple of
                 integers.
         """
-        return x // self.tile_size, y // self.tile_size
+        return int(x // self.tile_size), int(y // self.tile_size)
@@ -0,0 +1,24 @@
+from pygame.mask import Mask
+from pygame.surface import Surface
+from pygame.mask import from_surface as mask_from_surface
+
+masks: dict[Surface, Mask] = {}
+
+
+def get_mask(surface: Surface) -> Mask:
+    """Returns the collision mask of a surface, creating it only the
+    first time. Meant for long-lived surfaces, like animation frames,
+    that are shared by many sprites.
+
+    Args:
+        surface (Surface): The surface.
+
+    Returns:
+        Mask: The shared mask of the surface. It must not be modified.
+    """
+    mask = masks.get(surface)
+
+    if mask is None:
+        mask = masks[surface] = mask_from_surface(surface)
+
+    return mask
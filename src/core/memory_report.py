@@ -0,0 +1,101 @@
+"""Reports the memory used by each entity type.
+
+Run from the project root:
+
+    $ python -m src.core.memory_report [count]
+"""
+
+import os
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+import pygame
+from pygame.math import Vector2
+
+from src.sprites.entity import Entity
+from src.sprites.player import Player
+from src.sprites.enemy import Cactus, Coffin
+from src.sprites.object import Bullet, Obstacle
+from src.core.mapping_group import MappingGroup
+from settings import TILE_SIZE
+
+
+def measure(factory: Callable[[int], object], count: int) -> float:
+    """Measures the memory allocated per object created by a factory.
+
+    One object is created before the measurement, so caches shared by
+    all the objects of a type are not counted.
+
+    Args:
+        factory (Callable[[int], object]): Function creating the object
+            with the given index.
+        count (int): How many objects to create.
+
+    Returns:
+        float: The number of bytes allocated per object.
+    """
+    warm_up = factory(0)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    objects = [factory(i) for i in range(count)]
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del objects, warm_up
+
+    return (after - before) / count
+
+
+def report(count: int) -> dict[str, float]:
+    """Creates `count` objects of each type, placed as in the game, and
+    measures the bytes used by each one.
+
+    Args:
+        count (int): How many objects of each type to create.
+
+    Returns:
+        dict[str, float]: The bytes per object of each type.
+    """
+    all_sprites = pygame.sprite.Group()
+    enemies = MappingGroup(TILE_SIZE * 2)
+    obstacles = MappingGroup(TILE_SIZE * 2)
+    bullets = pygame.sprite.Group()
+
+    player = Player((0, 0), all_sprites)
+    surface = pygame.Surface((TILE_SIZE, TILE_SIZE))
+
+    def position(i: int) -> tuple[int, int]:
+        return (i % 100) * TILE_SIZE, (i // 100) * TILE_SIZE
+
+    factories = {
+        "Player": lambda i: Player(position(i)),
+        "Coffin": lambda i: Coffin(position(i), player, all_sprites, enemies),
+        "Cactus": lambda i: Cactus(position(i), player, all_sprites, enemies),
+        "Obstacle": lambda i: Obstacle(position(i), surface, all_sprites, obstacles),
+        "Bullet": lambda i: Bullet(
+            position(i), Vector2(1, 0), surface, all_sprites, bullets
+        ),
+    }
+
+    return {name: measure(factory, count) for name, factory in factories.items()}
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    Entity.frames_cache.clear()
+
+    print(f"{'type':<10} {'bytes/entity':>14} {'total (KiB)':>12}")
+
+    for name, size in report(count).items():
+        print(f"{name:<10} {size:>14,.0f} {size * count / 1024:>12,.1f}")
@@ -0,0 +1,294 @@
+import os
+import sys
+import threading
+from time import perf_counter, strftime
+from functools import wraps
+from contextlib import contextmanager
+from collections import Counter, defaultdict, deque
+from typing import Any, Iterator, NamedTuple, TextIO
+
+SAMPLER_SWITCH_INTERVAL = 0.001
+
+
+class FrameRecord(NamedTuple):
+    duration: float
+    phases: dict[str, float]
+    blocks: dict[str, int]
+    samples: list[str]
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval_ms: float = 10,
+        history: int = 600,
+        budget_ms: float = 1000 / 60,
+        output_dir: str = "profiles",
+        dump_interval: float = 5,
+        output: TextIO = sys.stdout,
+    ) -> None:
+        """Low overhead profiler for long sessions.
+
+        The game loop records the time spent in each phase of every
+        frame, and while enabled, a background thread samples the stack
+        of the main thread every `interval_ms`. Both are kept per frame
+        in a ring buffer, which can be dumped as folded stacks, the
+        input format of flamegraph.pl and speedscope. Each stack starts
+        with the phase it was sampled in.
+
+        Args:
+            interval_ms (float, optional): Time between two stack
+                samples. Defaults to 10.
+            history (int, optional): How many frames the ring buffer
+                keeps. Defaults to 600.
+            budget_ms (float, optional): Frames taking longer are dumped
+                automatically. Defaults to 1000 / 60.
+            output_dir (str, optional): Where the dumps are written.
+                Defaults to "profiles".
+            dump_interval (float, optional): Minimum time, in seconds,
+                between two automatic dumps. Defaults to 5.
+            output (TextIO, optional): Where the reports are written.
+                Defaults to the standard output.
+        """
+        self.interval = interval_ms / 1000
+        self.budget = budget_ms / 1000
+        self.output_dir = output_dir
+        self.dump_interval = dump_interval
+        self.output = output
+
+        self.enabled = False
+        self.frames: deque[FrameRecord] = deque(maxlen=history)
+
+        self.phase_name = "idle"
+        self.phase_times: dict[str, float] = defaultdict(float)
+        self.phase_blocks: dict[str, int] = defaultdict(int)
+        self.samples: list[str] = []
+        self.frame_start = perf_counter()
+        self.last_dump = 0.0
+
+        self.labels: dict[Any, str] = {}
+        self.wrapper_code = None
+        self.instrumented: list[tuple[Any, str, Any]] = []
+        self.hot_paths: list[tuple[Any, str]] = []
+
+        self.thread_id = threading.get_ident()
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.switch_interval = sys.getswitchinterval()
+
+    def add_hot_path(self, owner: Any, name: str) -> None:
+        """Registers a method whose inclusive time is recorded as a
+        phase of its own, named after it, while the profiler is enabled.
+
+        Args:
+            owner (Any): The class defining the method.
+            name (str): The method name.
+        """
+        self.hot_paths.append((owner, name))
+
+        if self.enabled:
+            self.__instrument(owner, name)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+
+        self.enabled = True
+        self.samples = []
+
+        for owner, name in self.hot_paths:
+            self.__instrument(owner, name)
+
+        # The sampler only runs when the main thread releases the GIL.
+        # A short switch interval makes it release the GIL soon after
+        # the sampler wakes up, instead of at the next blocking call,
+        # which would bias every sample towards those calls.
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(SAMPLER_SWITCH_INTERVAL)
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.__sample_loop, daemon=True)
+        self.thread.start()
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        self.stop_event.set()
+        self.thread.join()
+        sys.setswitchinterval(self.switch_interval)
+
+        for owner, name, original in reversed(self.instrumented):
+            setattr(owner, name, original)
+
+        self.instrumented.clear()
+
+    def toggle(self) -> None:
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def __instrument(self, owner: Any, name: str) -> None:
+        original = owner.__dict__[name]
+        label = f"{owner.__name__}.{name}"
+        phase_times = self.phase_times
+
+        @wraps(original)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+
+            try:
+                return original(*args, **kwargs)
+            finally:
+                phase_times[label] += perf_counter() - start
+
+        setattr(owner, name, timed)
+        self.wrapper_code = timed.__code__
+        self.instrumented.append((owner, name, original))
+
+    def __sample_loop(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            if frame is not None:
+                self.samples.append(self.fold(frame))
+
+            del frame
+
+    def fold(self, frame: Any) -> str:
+        """Turns a stack into a folded stack line, root first.
+
+        Args:
+            frame (Any): The innermost frame of the stack.
+
+        Returns:
+            str: The phase and the functions of the stack, separated by
+                semicolons.
+        """
+        names = []
+
+        while frame is not None:
+            code = frame.f_code
+            frame = frame.f_back
+
+            if code is self.wrapper_code:
+                continue
+
+            if code not in self.labels:
+                filename = os.path.relpath(code.co_filename)
+
+                if filename.startswith(".."):
+                    filename = os.path.basename(filename)
+
+                # co_qualname is only available from Python 3.11.
+                name = getattr(code, "co_qualname", code.co_name)
+                self.labels[code] = f"{name} ({filename})"
+
+            names.append(self.labels[code])
+
+        names.append(self.phase_name)
+
+        return ";".join(reversed(names))
+
+    def begin_frame(self) -> None:
+        self.frame_start = perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records the time spent in a phase of the frame and how many
+        memory blocks it left allocated. Both are cheap enough to be
+        recorded even while the profiler is disabled.
+
+        Args:
+            name (str): The phase name.
+        """
+        self.phase_name = name
+        blocks = sys.getallocatedblocks()
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            self.phase_times[name] += perf_counter() - start
+            self.phase_blocks[name] += sys.getallocatedblocks() - blocks
+            self.phase_name = "idle"
+
+    def end_frame(self) -> FrameRecord:
+        """Stores the frame in the ring buffer, dumping it when it took
+        longer than the budget while the profiler is enabled.
+
+        Returns:
+            FrameRecord: The frame.
+        """
+        samples, self.samples = self.samples, []
+
+        record = FrameRecord(
+            perf_counter() - self.frame_start,
+            dict(self.phase_times),
+            dict(self.phase_blocks),
+            samples,
+        )
+        self.frames.append(record)
+        self.phase_times.clear()
+        self.phase_blocks.clear()
+
+        if (
+            self.enabled
+            and record.duration > self.budget
+            and record.samples
+            and perf_counter() - self.last_dump > self.dump_interval
+        ):
+            self.last_dump = perf_counter()
+            self.dump([record], "slow-frame")
+
+        return record
+
+    def dump(
+        self, frames: list[FrameRecord] | None = None, name: str = "profile"
+    ) -> str:
+        """Writes the samples of some frames as folded stacks, and
+        prints the time spent in each phase.
+
+        Args:
+            frames (list[FrameRecord] | None, optional): The frames to
+                dump. Defaults to the whole ring buffer.
+            name (str, optional): Prefix of the file name. Defaults to
+                "profile".
+
+        Returns:
+            str: The path of the written file.
+        """
+        frames = list(self.frames) if frames is None else frames
+        stacks = Counter(sample for frame in frames for sample in frame.samples)
+        phases = Counter()
+
+        for frame in frames:
+            phases.update(frame.phases)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(
+            self.output_dir, f"{name}-{strftime('%Y%m%d-%H%M%S')}.folded"
+        )
+
+        with open(path, "w") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+        total = sum(frame.duration for frame in frames) * 1000
+        self.report(f"{len(frames)} frames, {total:.1f} ms, written to {path}")
+
+        for phase, duration in phases.most_common():
+            self.report(f"  {phase:<24} {duration * 1000:8.2f} ms")
+
+        return path
+
+    def report(self, message: str) -> None:
+        """Writes a line to the output of the reports. Every tool
+        watching the frames reports through here.
+
+        Args:
+            message (str): The line to write.
+        """
+        print(message, file=self.output, flush=True)
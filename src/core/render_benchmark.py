@@ -0,0 +1,99 @@
+"""Compares the sort and blit cost of `Camera2D` and `YSortCamera`.
+
+Run from the project root:
+
+    $ python -m src.core.render_benchmark [static] [moving] [frames]
+"""
+
+import os
+import sys
+import random
+from time import perf_counter
+
+import pygame
+from pygame.surface import Surface
+from pygutils.camera import Camera2D
+
+from src.core.y_sort_camera import YSortCamera
+from src.sprites.object import Obstacle
+from settings import TILE_SIZE, WINDOW_HEIGHT, WINDOW_WIDTH
+
+
+def populate(camera: Camera2D, static: int, moving: int) -> list[Obstacle]:
+    """Fills a camera with still sprites and sprites that will move.
+
+    Args:
+        camera (Camera2D): The camera to fill.
+        static (int): How many sprites never move.
+        moving (int): How many sprites move every frame.
+
+    Returns:
+        list[Obstacle]: The moving sprites.
+    """
+    random.seed(0)
+    surface = Surface((TILE_SIZE, TILE_SIZE))
+    size = int((static + moving) ** 0.5 * TILE_SIZE * 2)
+
+    def position() -> tuple[int, int]:
+        return random.randrange(size), random.randrange(size)
+
+    for _ in range(static):
+        Obstacle(position(), surface, camera)
+
+    return [Obstacle(position(), surface, camera) for _ in range(moving)]
+
+
+def measure(camera: Camera2D, moving: list[Obstacle], frames: int) -> dict:
+    """Draws a number of frames, moving the moving sprites a little
+    before each one.
+
+    Args:
+        camera (Camera2D): The camera to draw.
+        moving (list[Obstacle]): The sprites moved every frame.
+        frames (int): How many frames to draw.
+
+    Returns:
+        dict: The average sort and draw time per frame, in ms.
+    """
+    screen = pygame.display.get_surface()
+    target = moving[0] if moving else next(iter(camera))
+    sort_time = draw_time = 0
+
+    for _ in range(frames):
+        for sprite in moving:
+            sprite.rect.move_ip(random.randint(-2, 2), random.randint(-2, 2))
+
+        start = perf_counter()
+        camera.sprites()
+        sort_time += perf_counter() - start
+
+        start = perf_counter()
+        camera.draw(surface=screen, target=target)
+        draw_time += perf_counter() - start
+
+    return {
+        "sort": sort_time / frames * 1000,
+        "draw": draw_time / frames * 1000,
+    }
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    static = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    moving = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+
+    print(f"{static} still sprites, {moving} moving sprites, {frames} frames")
+    print(f"{'camera':<12} {'sort (ms)':>10} {'draw (ms)':>10}")
+
+    for camera_class in (Camera2D, YSortCamera):
+        camera = camera_class(None, 30)
+        result = measure(camera, populate(camera, static, moving), frames)
+
+        print(
+            f"{camera_class.__name__:<12} {result['sort']:>10.3f} {result['draw']:>10.3f}"
+        )
@@ -0,0 +1,122 @@
+import gc
+import tracemalloc
+from time import perf_counter
+from typing import Any
+
+from src.core.profiler import FrameRecord, SamplingProfiler
+
+
+class SpikeDetector:
+    def __init__(
+        self, profiler: SamplingProfiler, budget_ms: float, log_interval: float = 1
+    ) -> None:
+        """Logs the frames over budget with the time and memory blocks
+        of each phase, and the garbage collections that ran during the
+        frame, through the reports of the profiler. The collections are
+        only recorded between `start` and `stop`.
+
+        When tracemalloc is tracing, e.g. with `python -X tracemalloc`,
+        the log also lists the lines that allocated the most memory
+        since the previous spike.
+
+        Args:
+            profiler (SamplingProfiler): The profiler recording the
+                frame phases.
+            budget_ms (float): The maximum duration of a frame.
+            log_interval (float, optional): Minimum time, in seconds,
+                between two logs. The spikes in between are counted.
+                Defaults to 1.
+        """
+        self.profiler = profiler
+        self.budget = budget_ms / 1000
+        self.log_interval = log_interval
+
+        self.collections: list[tuple[int, str, float, int]] = []
+        self.collection_start = 0.0
+
+        self.spikes = 0
+        self.last_log = 0.0
+        self.snapshot = None
+
+    def start(self) -> None:
+        """Starts recording the garbage collections."""
+        if self.on_collection not in gc.callbacks:
+            gc.callbacks.append(self.on_collection)
+
+    def stop(self) -> None:
+        """Stops recording the garbage collections."""
+        if self.on_collection in gc.callbacks:
+            gc.callbacks.remove(self.on_collection)
+
+        self.collections.clear()
+
+    def on_collection(self, event: str, info: dict[str, Any]) -> None:
+        if event == "start":
+            self.collection_start = perf_counter()
+            return
+
+        self.collections.append(
+            (
+                info["generation"],
+                self.profiler.phase_name,
+                perf_counter() - self.collection_start,
+                info["collected"],
+            )
+        )
+
+    def check(self, record: FrameRecord) -> None:
+        """Logs the frame if it took longer than the budget.
+
+        Args:
+            record (FrameRecord): The frame that just ended.
+        """
+        collections, self.collections = self.collections, []
+
+        if record.duration <= self.budget:
+            return
+
+        self.spikes += 1
+
+        if perf_counter() - self.last_log < self.log_interval:
+            return
+
+        self.last_log = perf_counter()
+        self.log(record, collections)
+        self.spikes = 0
+
+    def log(
+        self, record: FrameRecord, collections: list[tuple[int, str, float, int]]
+    ) -> None:
+        phase = max(record.phases, key=record.phases.get, default="idle")
+        skipped = (
+            f", {self.spikes - 1} more since the last log" if self.spikes > 1 else ""
+        )
+
+        self.profiler.report(
+            f"Spike: frame took {record.duration * 1000:.1f} ms "
+            f"(budget {self.budget * 1000:.1f} ms), slowest phase {phase}{skipped}"
+        )
+
+        for name, duration in record.phases.items():
+            self.profiler.report(
+                f"  {name:<24} {duration * 1000:8.2f} ms "
+                f"{record.blocks.get(name, 0):+8d} blocks"
+            )
+
+        for generation, name, duration, collected in collections:
+            self.profiler.report(
+                f"  gc gen {generation} during {name}: {duration * 1000:.2f} ms, "
+                f"{collected} objects collected"
+            )
+
+        if tracemalloc.is_tracing():
+            self.log_allocations()
+
+    def log_allocations(self, limit: int = 5) -> None:
+        snapshot = tracemalloc.take_snapshot()
+
+        if self.snapshot is not None:
+            for stat in snapshot.compare_to(self.snapshot, "lineno")[:limit]:
+                self.profiler.report(f"  {stat}")
+
+        self.snapshot = snapshot
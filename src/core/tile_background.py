@@ -0,0 +1,158 @@
+from typing import Any, Sequence
+
+import numpy as np
+from pygame.rect import Rect
+from pygame.math import Vector2
+from pygame.surface import Surface
+
+
+class TileBackground:
+    def __init__(
+        self,
+        tiles: np.ndarray,
+        images: Sequence[Surface | None],
+        tile_size: int,
+        fill: tuple[int, int, int] = (0, 0, 0),
+    ) -> None:
+        """Draws a tile layer as the camera background, instead of a
+        single image of the whole map.
+
+        The visible tiles are composed into a buffer one tile larger
+        than the view, used as a ring: the tile (x, y) always lives at
+        (x % columns, y % rows) of the buffer. When the camera moves,
+        only the columns and rows of tiles that became visible are
+        drawn, and the buffer is blitted in up to four pieces around
+        the wrap point.
+
+        Args:
+            tiles (np.ndarray): The tile IDs of the layer, indexed by
+                row and column. 0 is an empty tile.
+            images (Sequence[Surface | None]): The image of each tile
+                ID, e.g. `TiledMap.images`.
+            tile_size (int): The size of the tiles.
+            fill (tuple[int, int, int], optional): The color of empty
+                tiles and of the area outside the layer. Defaults to
+                black.
+        """
+        self.tiles = tiles
+        self.images = images
+        self.tile_size = tile_size
+        self.fill = fill
+
+        self.buffer: Surface | None = None
+        self.size: tuple[int, int] | None = None
+        self.columns = 0
+        self.rows = 0
+        self.origin: tuple[int, int] | None = None
+
+    @classmethod
+    def from_layer(cls, tmx_map: Any, name: str, **kwargs) -> "TileBackground":
+        """Creates the background of a tile layer of a TMX map.
+
+        Args:
+            tmx_map (Any): The `pytmx.TiledMap`.
+            name (str): The layer name.
+
+        Returns:
+            TileBackground: The background.
+        """
+        layer = tmx_map.get_layer_by_name(name)
+
+        return cls(
+            np.array(layer.data, dtype=np.uint16),
+            tmx_map.images,
+            tmx_map.tilewidth,
+            **kwargs,
+        )
+
+    def resize(self, size: tuple[int, int]) -> None:
+        """Allocates the buffer for a view size. The buffer is redrawn
+        from scratch on the next draw.
+
+        Args:
+            size (tuple[int, int]): The size of the view.
+        """
+        self.columns = -(-size[0] // self.tile_size) + 1
+        self.rows = -(-size[1] // self.tile_size) + 1
+        self.buffer = Surface(
+            (self.columns * self.tile_size, self.rows * self.tile_size)
+        ).convert()
+        self.size = size
+        self.origin = None
+
+    def draw_tile(self, x: int, y: int) -> None:
+        size = self.tile_size
+        position = ((x % self.columns) * size, (y % self.rows) * size)
+        rows, columns = self.tiles.shape
+
+        self.buffer.fill(self.fill, (position, (size, size)))
+
+        if 0 <= x < columns and 0 <= y < rows:
+            image = self.images[self.tiles[y, x]]
+
+            if image is not None:
+                self.buffer.blit(image, position)
+
+    def update_buffer(self, origin: tuple[int, int]) -> None:
+        """Draws the tiles that became visible since the last frame.
+
+        Args:
+            origin (tuple[int, int]): The top left visible tile.
+        """
+        x, y = origin
+        xs = range(x, x + self.columns)
+        ys = range(y, y + self.rows)
+
+        if self.origin is None:
+            columns = xs
+        else:
+            old_x, old_y = self.origin
+            old_xs = range(old_x, old_x + self.columns)
+            old_ys = range(old_y, old_y + self.rows)
+
+            columns = [column for column in xs if column not in old_xs]
+            ys_exposed = [row for row in ys if row not in old_ys]
+
+            # The columns are drawn whole, so the exposed rows skip them.
+            for row in ys_exposed:
+                for column in xs:
+                    if column in old_xs:
+                        self.draw_tile(column, row)
+
+        for column in columns:
+            for row in ys:
+                self.draw_tile(column, row)
+
+        self.origin = origin
+
+    def draw(self, surface: Surface, offset: Vector2) -> None:
+        """Draws the background visible from a camera offset.
+
+        Args:
+            surface (Surface): The surface being drawn.
+            offset (Vector2): The camera offset, truncated like the
+                sprite positions.
+        """
+        width, height = size = surface.get_size()
+
+        if size != self.size:
+            self.resize(size)
+
+        x, y = int(offset.x), int(offset.y)
+        self.update_buffer((x // self.tile_size, y // self.tile_size))
+
+        buffer_width, buffer_height = self.buffer.get_size()
+        left, top = x % buffer_width, y % buffer_height
+        right, bottom = min(width, buffer_width - left), min(
+            height, buffer_height - top
+        )
+
+        surface.blits(
+            [
+                (self.buffer, (dest_x, dest_y), Rect(src_x, src_y, w, h))
+                for dest_x, src_x, w in ((0, left, right), (right, 0, width - right))
+                for dest_y, src_y, h in ((0, top, bottom), (bottom, 0, height - bottom))
+                if w > 0 and h > 0
+            ],
+            False,
+        )
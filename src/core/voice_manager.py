@@ -0,0 +1,94 @@
+from collections import Counter, defaultdict
+
+from pygame.mixer import Sound, find_channel
+from pygame.math import Vector2
+
+
+class VoiceManager:
+    def __init__(
+        self,
+        sounds: dict[str, Sound],
+        max_voices: int = 4,
+        max_distance: float = 1000,
+        min_volume: float = 0.05,
+    ) -> None:
+        self.sounds = sounds
+        self.max_voices = max_voices
+        self.max_distance = max_distance
+        self.min_volume = min_volume
+        self.muted = False
+
+        self.requests: dict[str, list[tuple[float, float] | None]] = defaultdict(list)
+        self.stats = Counter(played=0, dropped=0, coalesced=0)
+
+    def play(self, name: str, position: tuple[float, float] | None = None) -> None:
+        """Requests a sound to be played at the end of the frame.
+
+        Args:
+            name (str): The name of the sound.
+            position (tuple[float, float] | None, optional): World
+                position of the sound source. Sounds without position
+                are never attenuated. Defaults to None.
+        """
+        if not self.muted:
+            self.requests[name].append(position)
+
+    def get_distance(
+        self, listener: Vector2, positions: list[tuple[float, float] | None]
+    ) -> float:
+        """Returns the distance between the listener and the closest
+        source of a sound.
+
+        Args:
+            listener (Vector2): World position of the listener.
+            positions (list[tuple[float, float] | None]): The positions
+                where the sound was requested this frame.
+
+        Returns:
+            float: The distance to the closest source, 0 when any of
+                the requests has no position.
+        """
+        if None in positions:
+            return 0.0
+
+        return min(listener.distance_to(position) for position in positions)
+
+    def update(self, listener: tuple[float, float]) -> None:
+        """Plays the sounds requested during the frame.
+
+        Identical sounds requested in the same frame are coalesced into
+        a single voice at the source closest to the listener. Voices
+        are played closest first, with a volume attenuated by distance,
+        and dropped when too far away, when the sound already has
+        `max_voices` playing or when no mixer channel is free.
+
+        Args:
+            listener (tuple[float, float]): World position of the
+                listener, usually the player.
+        """
+        listener = Vector2(listener)
+        voices = []
+
+        for name, positions in self.requests.items():
+            self.stats["coalesced"] += len(positions) - 1
+            voices.append((self.get_distance(listener, positions), name))
+
+        self.requests.clear()
+
+        for distance, name in sorted(voices):
+            volume = 1 - distance / self.max_distance
+            sound = self.sounds[name]
+
+            if volume < self.min_volume or sound.get_num_channels() >= self.max_voices:
+                self.stats["dropped"] += 1
+                continue
+
+            channel = find_channel()
+
+            if channel is None:
+                self.stats["dropped"] += 1
+                continue
+
+            channel.play(sound)
+            channel.set_volume(volume)
+            self.stats["played"] += 1
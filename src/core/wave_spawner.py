@@ -0,0 +1,128 @@
+import random
+from collections import deque
+
+from pygutils.timer import Timer
+
+from src.sprites.entity import Entity
+from src.core.entity_pool import EntityPool
+
+
+class WaveSpawner:
+    def __init__(
+        self,
+        spawn_points: list[tuple[str, tuple[float, float]]],
+        pools: dict[str, EntityPool],
+        base_size: int,
+        growth: int,
+        spawns_per_frame: int,
+        prewarm_per_frame: int,
+        delay_ms: int,
+        spread: float = 0,
+    ) -> None:
+        """Spawns endless waves of enemies, reusing the dead ones.
+
+        Args:
+            spawn_points (list[tuple[str, tuple[float, float]]]): The
+                enemy name and position of each spawn point.
+            pools (dict[str, EntityPool]): The pool of each enemy name.
+            base_size (int): The number of enemies of the first wave.
+            growth (int): How many enemies each wave adds.
+            spawns_per_frame (int): Maximum enemies spawned per frame.
+            prewarm_per_frame (int): Maximum enemies created per frame,
+                while waiting for the next wave, to fill the pools.
+            delay_ms (int): Time between the end of a wave and the
+                start of the next one.
+            spread (float, optional): Maximum distance between an enemy
+                and its spawn point. Defaults to 0.
+        """
+        self.spawn_points = spawn_points
+        self.pools = pools
+        self.base_size = base_size
+        self.growth = growth
+        self.spawns_per_frame = spawns_per_frame
+        self.prewarm_per_frame = prewarm_per_frame
+        self.spread = spread
+
+        self.wave = 0
+        self.next_wave = self.plan_wave(1)
+        self.pending: deque[tuple[str, tuple[float, float]]] = deque()
+        # The pool each living enemy goes back to when it dies.
+        self.alive: dict[Entity, str] = {}
+
+        self.delay = Timer(delay_ms, self.start_wave)
+        self.delay.activate()
+
+    def plan_wave(self, wave: int) -> list[tuple[str, tuple[float, float]]]:
+        """Chooses where each enemy of a wave will spawn.
+
+        Args:
+            wave (int): The wave number, starting at 1.
+
+        Returns:
+            list[tuple[str, tuple[float, float]]]: The enemy name and
+                position of each spawn.
+        """
+        spawns = []
+
+        for _ in range(self.base_size + self.growth * (wave - 1)):
+            name, (x, y) = random.choice(self.spawn_points)
+            spawns.append(
+                (
+                    name,
+                    (
+                        x + random.uniform(-self.spread, self.spread),
+                        y + random.uniform(-self.spread, self.spread),
+                    ),
+                )
+            )
+
+        return spawns
+
+    def start_wave(self) -> None:
+        self.wave += 1
+        self.pending.extend(self.next_wave)
+        self.next_wave = self.plan_wave(self.wave + 1)
+
+    def prewarm(self) -> None:
+        """Fills the pools for the next wave, creating at most
+        `prewarm_per_frame` enemies.
+        """
+        budget = self.prewarm_per_frame
+
+        for name, pool in self.pools.items():
+            needed = sum(1 for spawn in self.next_wave if spawn[0] == name)
+            count = min(budget, needed - len(pool))
+
+            if count > 0:
+                pool.prewarm(count)
+                budget -= count
+
+    def spawn(self) -> None:
+        """Spawns at most `spawns_per_frame` of the pending enemies."""
+        for _ in range(min(self.spawns_per_frame, len(self.pending))):
+            name, position = self.pending.popleft()
+
+            enemy = self.pools[name].acquire(position)
+            enemy.events.subscribe("monster:death", self)
+
+            self.alive[enemy] = name
+
+    def update(self) -> None:
+        if self.pending:
+            self.spawn()
+        elif self.delay.active:
+            self.prewarm()
+            self.delay.update()
+        elif not self.alive:
+            self.delay.activate()
+
+    def notify(self, event: str, *args, **kwargs) -> None:
+        match event.split(":"):
+            case ["monster", "death"]:
+                self.release(*args, **kwargs)
+
+    def release(self, entity: Entity) -> None:
+        name = self.alive.pop(entity, None)
+
+        if name is not None:
+            self.pools[name].release(entity)
@@ -0,0 +1,104 @@
+from operator import attrgetter
+from typing import Any
+
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+from pygame.surface import Surface
+from pygutils.camera import Camera2D
+
+from src.core.tile_background import TileBackground
+
+get_rect = attrgetter("rect")
+get_centery = attrgetter("rect.centery")
+
+
+class YSortCamera(Camera2D):
+    def __init__(
+        self, background: Surface | TileBackground | None, *args, **kwargs
+    ) -> None:
+        """Camera that keeps its sprites sorted by `rect.centery` between
+        frames, instead of sorting them from scratch on every draw.
+
+        Accepts the same arguments as `Camera2D`, and a `TileBackground`
+        in place of the background surface.
+        """
+        self.order: list[Any] = []
+        self.added: list[Any] = []
+        self.removed: set[Any] = set()
+
+        if isinstance(background, TileBackground):
+            self.background = background
+            background = None
+        else:
+            self.background = None
+
+        super().__init__(background, *args, **kwargs)
+
+    def add_internal(self, sprite: Any, layer: None = None) -> None:
+        super().add_internal(sprite, layer)
+
+        if sprite in self.removed:
+            self.removed.discard(sprite)
+        else:
+            self.added.append(sprite)
+
+    def remove_internal(self, sprite: Any) -> None:
+        super().remove_internal(sprite)
+
+        if sprite in self.added:
+            self.added.remove(sprite)
+        else:
+            self.removed.add(sprite)
+
+    def sprites(self) -> list[Sprite]:
+        self.sort()
+        return list(self.order)
+
+    def sort(self) -> None:
+        """Brings the order up to date with the sprites of the group.
+
+        The order of the last frame is kept, so only the sprites that
+        moved or were added are out of place. `list.sort` finds the
+        sorted runs and places the other sprites by binary insertion,
+        close to linear time on such nearly sorted data, while sorting
+        the sprites from scratch is O(n log n) every frame.
+        """
+        if self.removed:
+            self.order = [sprite for sprite in self.order if sprite not in self.removed]
+            self.removed.clear()
+
+        if self.added:
+            self.order.extend(self.added)
+            self.added.clear()
+
+        self.order.sort(key=get_centery)
+
+    def get_visible_sprites(self, surface: Surface) -> list[tuple[Surface, Rect]]:
+        """Selects the sprites inside the camera view, in Y order, with
+        their rects moved to screen coordinates.
+
+        `Camera2D.draw` calls it after moving the offset and before
+        blitting the sprites, so the tile background is drawn here,
+        under the sprites and with the same offset.
+
+        Args:
+            surface (Surface): The surface being drawn.
+
+        Returns:
+            list[tuple[Surface, Rect]]: The `blits` sequence.
+        """
+        self.sort()
+
+        # Truncated like the background position, so both stay aligned.
+        x, y = int(self.offset.x), int(self.offset.y)
+
+        if self.background is not None:
+            self.background.draw(surface, self.offset)
+
+        view = surface.get_rect(topleft=(x, y))
+        order = self.order
+
+        return [
+            (order[index].image, order[index].rect.move(-x, -y))
+            for index in view.collidelistall(list(map(get_rect, order)))
+        ]
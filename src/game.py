@@ -1,74 +1,215 @@
+import os
 import sys
+from functools import partial
 
 import pygame
-from pytmx.util_pygame import load_pygame
 from pygutils.camera import Camera2D
 
 from src.sprites.entity import Entity
 from src.sprites.player import Player
-from src.sprites.enemy import Cactus, Coffin
+from src.sprites.enemy import Cactus, Coffin, Monster
 from src.sprites.health_bar import HealthBar
 from src.sprites.object import Bullet, Obstacle
+from src.core.asset_loader import AssetLoader
+from src.core.behaviour_tree import BehaviourScheduler
+from src.core.bullet_hits import BulletHitTester
+from src.core.collision_resolver import CollisionResolver
+from src.core.entity_pool import EntityPool
+from src.core.frame_pacer import FramePacer
+from src.core.gc_manager import GCManager
+from src.core.line_of_sight import LineOfSight
 from src.core.mapping_group import MappingGroup
+from src.core.profiler import SamplingProfiler
+from src.core.spike_detector import SpikeDetector
+from src.core.tile_background import TileBackground
+from src.core.voice_manager import VoiceManager
+from src.core.wave_spawner import WaveSpawner
+from src.core.y_sort_camera import YSortCamera
 from settings import (
+    AI_BUDGET_MS,
+    ASSET_BUNDLE_DIR,
+    ASSET_LOADER_WORKERS,
+    ENDLESS_WAVES,
+    FRAME_BUDGET_MS,
     FRAME_RATE_LIMITER,
+    GC_IDLE_THRESHOLDS,
+    GC_MANAGED,
+    GC_THRESHOLDS,
+    LOADING_FRAME_BUDGET_MS,
+    MAX_SIMULATION_STEPS,
+    MAX_VOICES_PER_SOUND,
+    PROFILER_DIR,
+    PROFILER_ENV_VAR,
+    PROFILER_HISTORY,
+    PROFILER_INTERVAL_MS,
+    PACING_BUSY_WAIT_MS,
+    SIMULATION_TICK_RATE,
+    SOUND_MAX_DISTANCE,
+    SPIKE_LOG_INTERVAL,
+    PATHS,
     TILE_SIZE,
     GAME_TITLE,
     WINDOW_WIDTH,
     WINDOW_HEIGHT,
+    WAVE_BASE_SIZE,
+    WAVE_DELAY_MS,
+    WAVE_GROWTH,
+    WAVE_PREWARM_PER_FRAME,
+    WAVE_SPAWNS_PER_FRAME,
 )
 
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(self, headless: bool = False) -> None:
+        """Creates the game world.
+
+        Args:
+            headless (bool, optional): Runs without window and sound,
+                for servers and tools driving `update` directly.
+                Defaults to False.
+        """
+        self.headless = headless
+
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+            # Nothing pumps the SDL events without a window, so SIGINT and
+            # SIGTERM must keep their default handlers instead of becoming
+            # SDL_QUIT events.
+            os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
         pygame.mixer.pre_init(44100, 16, 2, 4096)
         pygame.init()
 
         pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
 
-        self.bg_surf = pygame.image.load("graphics/other/bg.png").convert()
-
         self.screen = pygame.display.get_surface()
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 18, bold=True)
 
+        # The loading screen already handles the profiler keys.
+        self.profiler = self.init_profiler()
+        self.spikes = SpikeDetector(self.profiler, FRAME_BUDGET_MS, SPIKE_LOG_INTERVAL)
+        self.gc = GCManager(GC_THRESHOLDS, GC_IDLE_THRESHOLDS)
+
+        self.loader = AssetLoader(ASSET_LOADER_WORKERS)
+        Entity.asset_loader = self.loader
+
+        self.queue_assets()
+        self.load_assets()
+
+        self.background = TileBackground.from_layer(
+            self.loader.get("data/map.tmx"), "Ground"
+        )
+        self.bullet_surface = self.loader.get("graphics/other/particle.png")
+
+        self.enemy_map = {
+            "Cactus": Cactus,
+            "Coffin": Coffin,
+        }
+
         self.groups = self.init_groups()
         self.map = self.init_map()
-
-        self.bullet_surface = pygame.image.load(
-            "graphics/other/particle.png"
-        ).convert_alpha()
+        self.resolver = CollisionResolver(self.groups["obstacles"])
+        self.hit_tester = BulletHitTester(self.bullet_surface, self.groups["obstacles"])
+        self.line_of_sight = LineOfSight(self.groups["obstacles"], TILE_SIZE)
+        Monster.line_of_sight = self.line_of_sight
+        self.behaviours = BehaviourScheduler(AI_BUDGET_MS)
+        self.spawner = (
+            self.init_spawner(self.loader.get("data/map.tmx"))
+            if ENDLESS_WAVES
+            else None
+        )
 
         self.sounds = self.init_sounds()
-        self.sounds["music"].play(-1)
+        self.voices = VoiceManager(
+            self.sounds, MAX_VOICES_PER_SOUND, SOUND_MAX_DISTANCE
+        )
+        self.voices.muted = headless
+
+        if not headless:
+            self.play_music()
 
         self.health_bars = {}
 
+        self.pacer = FramePacer(
+            SIMULATION_TICK_RATE,
+            FRAME_RATE_LIMITER,
+            MAX_SIMULATION_STEPS,
+            PACING_BUSY_WAIT_MS,
+        )
+
+    def queue_assets(self) -> None:
+        """Schedules every asset needed by the game on the asset
+        loader.
+        """
+        self.loader.queue_map("data/map.tmx")
+        self.loader.queue_image("graphics/other/particle.png")
+
+        self.loader.queue_animations(PATHS.values(), ASSET_BUNDLE_DIR)
+
+        self.loader.queue_sound("sound/bullet.wav", volume=0.2)
+        self.loader.queue_sound("sound/hit.mp3", volume=0.2)
+
+    def load_assets(self) -> None:
+        """Keeps rendering a loading screen while the asset loader
+        finishes its work, spending at most `LOADING_FRAME_BUDGET_MS`
+        per frame on the main thread.
+        """
+        while not self.loader.update(LOADING_FRAME_BUDGET_MS):
+            self.handle_events()
+            self.render_loading()
+
+            pygame.display.update()
+            self.clock.tick(FRAME_RATE_LIMITER)
+
+    def render_loading(self) -> None:
+        width, height = WINDOW_WIDTH // 2, 16
+        bar_rect = pygame.Rect(0, 0, width, height)
+        bar_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+
+        self.screen.fill((0, 0, 0))
+
+        pygame.draw.rect(self.screen, (255, 255, 255), bar_rect, 2, border_radius=5)
+        pygame.draw.rect(
+            self.screen,
+            (214, 75, 41),
+            (bar_rect.x + 3, bar_rect.y + 3, (width - 6) * self.loader.progress, 10),
+            border_radius=3,
+        )
+
+        text = self.font.render(
+            f"Loading... {round(self.loader.progress * 100)}%",
+            1,
+            pygame.Color("WHITE"),
+        )
+        self.screen.blit(text, text.get_rect(midbottom=bar_rect.move(0, -10).midtop))
+
     def init_groups(self) -> dict[str, pygame.sprite.Group]:
         return {
-            "all_sprites": Camera2D(self.bg_surf, 30),
+            "all_sprites": YSortCamera(self.background, 30),
             "obstacles": MappingGroup(TILE_SIZE * 2),
             "bullets": pygame.sprite.Group(),
             "enemies": MappingGroup(TILE_SIZE * 2),
+            "players": MappingGroup(TILE_SIZE * 2),
             "health_bar": pygame.sprite.Group(),
         }
 
     def init_sounds(self) -> dict[str, pygame.mixer.Sound]:
-        bullet_sound = pygame.mixer.Sound("sound/bullet.wav")
-        music_sound = pygame.mixer.Sound("sound/music.mp3")
-        hit_sound = pygame.mixer.Sound("sound/hit.mp3")
-
-        bullet_sound.set_volume(0.2)
-        music_sound.set_volume(0.1)
-        hit_sound.set_volume(0.2)
-
         return {
-            "bullet": bullet_sound,
-            "music": music_sound,
-            "hit": hit_sound,
+            "bullet": self.loader.get("sound/bullet.wav"),
+            "hit": self.loader.get("sound/hit.mp3"),
         }
 
+    def play_music(self) -> None:
+        """Streams the background music instead of decoding the whole
+        file into memory.
+        """
+        pygame.mixer.music.load("sound/music.mp3")
+        pygame.mixer.music.set_volume(0.1)
+        pygame.mixer.music.play(-1)
+
     def __create_fence(self, tmx_map) -> None:
         for x, y, surface in tmx_map.get_layer_by_name("Fence").tiles():
             Obstacle(
@@ -89,35 +230,95 @@ class Game:
 
     def __create_entities(self, tmx_map) -> dict[str, Entity]:
         entities = {}
-        enemy_map = {
-            "Cactus": Cactus,
-            "Coffin": Coffin,
-        }
 
         for obj in tmx_map.get_layer_by_name("Entities"):
             if obj.name == "Player":
-                player = Player((obj.x, obj.y), self.groups["all_sprites"])
-                player.events.subscribe("player:move", self)
-                player.events.subscribe("player:attack", self)
-                player.events.subscribe("received:damage", self)
-
+                player = self.create_player((obj.x, obj.y))
                 entities["player"] = player
 
-            if obj.name in enemy_map:
-                groups = [self.groups["all_sprites"], self.groups["enemies"]]
-                enemy_name = obj.name.lower()
+            if obj.name in self.enemy_map and not ENDLESS_WAVES:
+                self.create_enemy(obj.name.lower(), (obj.x, obj.y), player)
 
-                enemy = enemy_map[obj.name]((obj.x, obj.y), player, groups)
-                enemy.events.subscribe(f"{enemy_name}:move", self)
-                enemy.events.subscribe("received:damage", self)
+        return entities
 
-                if enemy_name == "cactus":
-                    enemy.events.subscribe("cactus:attack", self)
+    def __get_spawn_points(self, tmx_map) -> list[tuple[str, tuple[float, float]]]:
+        return [
+            (obj.name.lower(), (obj.x, obj.y))
+            for obj in tmx_map.get_layer_by_name("Entities")
+            if obj.name in self.enemy_map
+        ]
+
+    def create_enemy(
+        self, enemy_name: str, position: tuple[int, int], player: Player
+    ) -> Entity:
+        """Creates an enemy and wires its events to the game.
+
+        Args:
+            enemy_name (str): The lowercase enemy name, e.g. "cactus".
+            position (tuple[int, int]): The enemy spawn position.
+            player (Player): The player chased by the enemy.
+
+        Returns:
+            Entity: The new enemy.
+        """
+        groups = [self.groups["all_sprites"], self.groups["enemies"]]
+
+        enemy = self.enemy_map[enemy_name.capitalize()](position, player, groups)
+        enemy.events.subscribe("received:damage", self)
+
+        if enemy_name == "cactus":
+            enemy.events.subscribe("cactus:attack", self)
+
+        return enemy
+
+    def init_spawner(self, tmx_map) -> WaveSpawner:
+        """Creates the spawner of the endless waves, with a pool of
+        reusable enemies for each enemy type.
+        """
+        pools = {
+            name.lower(): EntityPool(
+                partial(self.create_enemy, name.lower(), player=self.map["player"]),
+                self.groups["all_sprites"],
+                self.groups["enemies"],
+            )
+            for name in self.enemy_map
+        }
 
-        return entities
+        return WaveSpawner(
+            self.__get_spawn_points(tmx_map),
+            pools,
+            WAVE_BASE_SIZE,
+            WAVE_GROWTH,
+            WAVE_SPAWNS_PER_FRAME,
+            WAVE_PREWARM_PER_FRAME,
+            WAVE_DELAY_MS,
+            spread=TILE_SIZE,
+        )
+
+    def create_player(
+        self, position: tuple[int, int], player_class: type[Player] = Player
+    ) -> Player:
+        """Creates a player and wires its events to the game.
+
+        Args:
+            position (tuple[int, int]): The player spawn position.
+            player_class (type[Player], optional): The class of the
+                player, allowing players controlled by other sources
+                than the keyboard. Defaults to Player.
+
+        Returns:
+            Player: The new player.
+        """
+        player = player_class(
+            position, self.groups["all_sprites"], self.groups["players"]
+        )
+        player.events.subscribe("player:attack", self)
+        player.events.subscribe("received:damage", self)
+
+        return player
 
     def init_map(self) -> dict[str, pygame.sprite.Sprite]:
-        tmx_map = load_pygame("data/map.tmx")
+        tmx_map = self.loader.get("data/map.tmx")
 
         self.__create_fence(tmx_map)
         self.__create_objects(tmx_map)
@@ -130,56 +331,42 @@ class Game:
                 pygame.quit()
                 sys.exit()
 
-    def collision_entity_obstacles(
-        self, entity: Entity, axis: str, direction: pygame.math.Vector2
-    ):
-        for sprite in self.groups["obstacles"].near_sprites(entity.hitbox.center):
-            if sprite.hitbox.colliderect(entity.hitbox):
-                if axis == "horizontal":
-                    if direction.x > 0:
-                        entity.hitbox.right = sprite.hitbox.left
-                    else:
-                        entity.hitbox.left = sprite.hitbox.right
-                else:
-                    if direction.y < 0:
-                        entity.hitbox.top = sprite.hitbox.bottom
-                    else:
-                        entity.hitbox.bottom = sprite.hitbox.top
-
-                entity.pos = pygame.math.Vector2(entity.hitbox.center)
-                entity.rect.center = entity.hitbox.center
-
-    def bullet_collision(self, bullet: Bullet) -> None:
-        if pygame.sprite.collide_mask(bullet, self.map["player"]):
-            self.map["player"].damage()
-            self.sounds["hit"].play()
-            bullet.kill()
-            return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+                self.profiler.report(
+                    f"Profiler {'on' if self.profiler.enabled else 'off'}"
+                )
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.dump()
+
+    def bullet_collisions(self) -> None:
+        """Tests every bullet moved in this step at once, then applies
+        the damage, hit sounds and bullet kills of all the hits.
+        """
+        hits = self.hit_tester.test(
+            self.groups["bullets"].sprites(),
+            [*self.groups["players"].sprites(), *self.groups["enemies"].sprites()],
+        )
 
-        for enemy in self.groups["enemies"].near_sprites(bullet.rect.center):
-            if pygame.sprite.collide_mask(bullet, enemy):
-                enemy.damage()
-                self.sounds["hit"].play()
-                bullet.kill()
-                return
+        for bullet, sprite in hits:
+            if isinstance(sprite, Entity):
+                sprite.damage()
+                self.voices.play("hit", bullet.rect.center)
 
-        for obstacle in self.groups["obstacles"].near_sprites(bullet.rect.center):
-            if bullet.rect.colliderect(obstacle.hitbox):
-                bullet.kill()
-                break
+            bullet.kill()
 
     def create_bullet(
         self, position: tuple[int, int], direction: pygame.math.Vector2
     ) -> None:
-        self.sounds["bullet"].play()
-        bullet = Bullet(
+        self.voices.play("bullet", position)
+        Bullet(
             position,
             direction,
             self.bullet_surface,
             self.groups["all_sprites"],
             self.groups["bullets"],
         )
-        bullet.events.subscribe("bullet:move", self)
 
     def create_health_bar(self, entity: Entity) -> None:
         if entity in self.health_bars and self.health_bars[entity].alive():
@@ -191,16 +378,12 @@ class Game:
         )
 
     def render_fps(self):
-        fps = str(round(self.clock.get_fps(), 2))
+        fps = str(round(self.pacer.fps, 2))
         fps_t = self.font.render(f"FPS: {fps}", 1, pygame.Color("RED"))
         self.screen.blit(fps_t, (10, 10))
 
     def notify(self, event: str, *args, **kwargs) -> None:
         match event.split(":"):
-            case ["bullet", "move"]:
-                action = self.bullet_collision
-            case [_, "move"]:
-                action = self.collision_entity_obstacles
             case [_, "attack"]:
                 action = self.create_bullet
             case ["received", "damage"]:
@@ -210,21 +393,131 @@ class Game:
 
         action(*args, **kwargs)
 
+    def moving_sprites(self) -> list[pygame.sprite.Sprite]:
+        return [
+            *self.groups["players"].sprites(),
+            *self.groups["enemies"].sprites(),
+            *self.groups["bullets"].sprites(),
+        ]
+
+    def update(self, dt: float) -> None:
+        """Runs a single fixed simulation step.
+
+        Args:
+            dt (float): The fixed step duration, in seconds.
+        """
+        for sprite in self.moving_sprites():
+            sprite.prev_pos.update(sprite.pos)
+
+        self.behaviours.update(self.groups["enemies"])
+
+        for entity in [*self.groups["enemies"], *self.groups["players"]]:
+            entity.decide()
+
+        # The movement is resolved before the entities animate, like
+        # the shots fired from their position, and before an attack
+        # that ends this step lets them walk again.
+        self.resolver.resolve(self.groups["enemies"], dt)
+        self.resolver.resolve(self.groups["players"], dt)
+
+        self.groups["enemies"].update(dt)
+        self.groups["players"].update(dt)
+
+        self.groups["bullets"].update(dt)
+        self.bullet_collisions()
+        self.groups["health_bar"].update()
+
+    def render(self, alpha: float) -> None:
+        """Draws the frame with the moving sprites interpolated between
+        their last two simulation positions.
+
+        Args:
+            alpha (float): Interpolation factor between the previous
+                and the current simulation step.
+        """
+        sprites = self.moving_sprites()
+        centers = [sprite.rect.center for sprite in sprites]
+
+        for sprite in sprites:
+            position = sprite.prev_pos.lerp(sprite.pos, alpha)
+            sprite.rect.center = (round(position.x), round(position.y))
+
+        rects_to_update = self.groups["all_sprites"].draw(
+            surface=self.screen,
+            target=self.map["player"],
+        )
+
+        for sprite, center in zip(sprites, centers):
+            sprite.rect.center = center
+
+        self.render_fps()
+
+        pygame.display.update(rects_to_update)
+
+    def init_profiler(self) -> SamplingProfiler:
+        """Creates the sampling profiler, covering the hot paths of each
+        frame. F3 toggles it.
+        """
+        profiler = SamplingProfiler(
+            PROFILER_INTERVAL_MS,
+            PROFILER_HISTORY,
+            FRAME_BUDGET_MS,
+            PROFILER_DIR,
+        )
+
+        profiler.add_hot_path(MappingGroup, "update")
+        profiler.add_hot_path(Entity, "animate")
+        profiler.add_hot_path(Game, "notify")
+        profiler.add_hot_path(Camera2D, "draw")
+
+        return profiler
+
     def run(self) -> None:
-        while True:
-            self.handle_events()
-            dt = self.clock.tick(FRAME_RATE_LIMITER) / 1000
+        """Runs the game loop until the game quits. The garbage
+        collection is only managed here, where the idle time between
+        frames is known, and is restored when the loop exits. The
+        profiler also starts enabled here when the PROFILER_ENV_VAR
+        environment variable is set, since only this loop ends its
+        frames and keeps its samples bounded.
+        """
+        if os.environ.get(PROFILER_ENV_VAR):
+            self.profiler.enable()
 
-            self.groups["enemies"].update(dt)
-            self.map["player"].update(dt)
-            self.groups["bullets"].update(dt)
-            self.groups["health_bar"].update()
+        self.spikes.start()
 
-            rects_to_update = self.groups["all_sprites"].draw(
-                surface=self.screen,
-                target=self.map["player"],
-            )
+        if GC_MANAGED:
+            self.gc.freeze()
+
+        try:
+            while True:
+                self.profiler.begin_frame()
+
+                with self.profiler.phase("events"):
+                    self.handle_events()
+
+                with self.profiler.phase("update"):
+                    # Once per frame, so catch-up steps don't multiply the
+                    # spawns and pool refills done in a single frame.
+                    if self.spawner is not None:
+                        self.spawner.update()
+
+                    for _ in range(self.pacer.begin_frame()):
+                        self.update(self.pacer.step)
+
+                with self.profiler.phase("audio"):
+                    self.voices.update(self.map["player"].pos)
+
+                with self.profiler.phase("render"):
+                    self.render(self.pacer.alpha)
+
+                self.spikes.check(self.profiler.end_frame())
+
+                if GC_MANAGED:
+                    self.gc.collect_idle(self.pacer.idle_time())
 
-            self.render_fps()
+                self.pacer.wait()
+        finally:
+            self.spikes.stop()
 
-            pygame.display.update(rects_to_update)
+            if GC_MANAGED:
+                self.gc.restore()
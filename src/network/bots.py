@@ -0,0 +1,123 @@
+"""Simulated clients for load testing the arena server over localhost.
+
+Run from the project root, with the server already running:
+
+    $ python -m src.network.bots [--clients N] [--seconds S]
+"""
+
+import random
+import asyncio
+import argparse
+from time import perf_counter
+from asyncio import IncompleteReadError
+
+from src.network.protocol import (
+    INPUT,
+    KEYS,
+    SNAPSHOT,
+    WELCOME,
+    INPUT_BODY,
+    EntityState,
+    decode_snapshot,
+    encode_keys,
+    read_message,
+    write_message,
+)
+from settings import SERVER_HOST, SERVER_PORT
+
+INPUT_RATE = 20
+SNAPSHOT_HISTORY = 64
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.entities_seen = 0
+
+        self.last_seq = 0
+        self.snapshots: dict[int, dict[int, EntityState]] = {}
+
+    async def receive(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            kind, body = await read_message(reader)
+            self.bytes_received += len(body) + 5
+
+            if kind != SNAPSHOT:
+                continue
+
+            seq, state = decode_snapshot(body, self.snapshots)
+
+            self.snapshots[seq] = state
+            self.snapshots.pop(seq - SNAPSHOT_HISTORY, None)
+            self.last_seq = max(self.last_seq, seq)
+            self.snapshots_received += 1
+            self.entities_seen += len(state)
+
+    async def run(self, host: str, port: int, seconds: float) -> None:
+        """Connects to the server and plays randomly, changing the
+        pressed keys every few inputs.
+
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+            seconds (float): For how long to play.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+
+        kind, body = await read_message(reader)
+        assert kind == WELCOME, "the server must greet the client first"
+
+        receiver = asyncio.create_task(self.receive(reader))
+        deadline = perf_counter() + seconds
+        keys = set()
+        input_seq = 0
+
+        try:
+            while perf_counter() < deadline and not receiver.done():
+                if input_seq % 10 == 0:
+                    keys = set(random.sample(KEYS, random.randint(0, 2)))
+
+                input_seq += 1
+                write_message(
+                    writer,
+                    INPUT,
+                    INPUT_BODY.pack(input_seq, self.last_seq, encode_keys(keys)),
+                )
+
+                await asyncio.sleep(1 / INPUT_RATE)
+        finally:
+            receiver.cancel()
+            writer.close()
+
+            if receiver.done() and not receiver.cancelled():
+                exception = receiver.exception()
+
+                if exception and not isinstance(exception, IncompleteReadError):
+                    raise exception
+
+
+async def main(host: str, port: int, clients: int, seconds: float) -> None:
+    bots = [Bot() for _ in range(clients)]
+
+    await asyncio.gather(*(bot.run(host, port, seconds) for bot in bots))
+
+    bandwidth = sum(bot.bytes_received for bot in bots) / clients / seconds
+    snapshots = sum(bot.snapshots_received for bot in bots)
+    entities = sum(bot.entities_seen for bot in bots) / max(snapshots, 1)
+
+    print(f"clients: {clients}")
+    print(f"snapshots decoded: {snapshots}")
+    print(f"entities per snapshot: {entities:.1f}")
+    print(f"bandwidth: {bandwidth / 1024:.2f} KiB/s per client")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Western Shooter load test bots")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.host, args.port, args.clients, args.seconds))
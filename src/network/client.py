@@ -0,0 +1,202 @@
+"""Thin arena client: sends the keyboard inputs and renders the
+snapshots received from the server.
+
+Run from the project root:
+
+    $ python -m src.network.client [--host HOST] [--port PORT]
+"""
+
+import asyncio
+import argparse
+from asyncio import IncompleteReadError, StreamReader
+
+import pygame
+from pygame.surface import Surface
+
+from src.sprites.entity import Entity
+from src.sprites.object import Obstacle
+from src.sprites.compact_sprite import CompactSprite
+from src.core.asset_loader import AssetLoader
+from src.core.tile_background import TileBackground
+from src.core.y_sort_camera import YSortCamera
+from src.network.protocol import (
+    INPUT,
+    KEYS,
+    KINDS,
+    SNAPSHOT,
+    STATUSES,
+    WELCOME,
+    INPUT_BODY,
+    WELCOME_BODY,
+    EntityState,
+    decode_snapshot,
+    encode_keys,
+    read_message,
+    write_message,
+)
+from settings import (
+    ASSET_BUNDLE_DIR,
+    FRAME_RATE_LIMITER,
+    GAME_TITLE,
+    PATHS,
+    SERVER_HOST,
+    SERVER_PORT,
+    TILE_SIZE,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+
+SNAPSHOT_HISTORY = 64
+
+
+class EntityView(CompactSprite):
+    __slots__ = ("image", "rect")
+
+    def __init__(self, image: Surface, *groups) -> None:
+        self.image = image
+        self.rect = image.get_rect()
+
+        super().__init__(*groups)
+
+
+class ArenaClient:
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT) -> None:
+        self.host = host
+        self.port = port
+
+        pygame.init()
+        pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption(f"{GAME_TITLE} - {host}:{port}")
+
+        self.screen = pygame.display.get_surface()
+
+        loader = AssetLoader()
+        Entity.asset_loader = loader
+
+        loader.queue_map("data/map.tmx")
+        loader.queue_image("graphics/other/particle.png")
+        loader.queue_animations(
+            [PATHS[kind] for kind in KINDS if kind in PATHS], ASSET_BUNDLE_DIR
+        )
+
+        loader.wait()
+
+        self.frames = {
+            kind: Entity.import_frames(PATHS[kind]) for kind in KINDS if kind in PATHS
+        }
+        self.bullet_surface = loader.get("graphics/other/particle.png")
+
+        tmx_map = loader.get("data/map.tmx")
+        self.camera = YSortCamera(TileBackground.from_layer(tmx_map, "Ground"), 30)
+        self.create_obstacles(tmx_map)
+
+        self.player_id = 0
+        self.snapshots: dict[int, dict[int, EntityState]] = {}
+        self.last_seq = 0
+        self.views: dict[int, EntityView] = {}
+        self.target = EntityView(Surface((1, 1)))
+
+    def create_obstacles(self, tmx_map) -> None:
+        for x, y, surface in tmx_map.get_layer_by_name("Fence").tiles():
+            Obstacle((x * TILE_SIZE, y * TILE_SIZE), surface, self.camera)
+
+        for obj in tmx_map.get_layer_by_name("Objects"):
+            Obstacle((obj.x, obj.y), obj.image, self.camera)
+
+    def get_image(self, entity: EntityState) -> Surface:
+        kind, _, _, status, frame, _ = entity
+
+        if KINDS[kind] == "bullet":
+            return self.bullet_surface
+
+        frames = self.frames[KINDS[kind]][STATUSES[status]]
+        return frames[min(frame, len(frames) - 1)]
+
+    def apply_snapshot(self, state: dict[int, EntityState]) -> None:
+        """Synchronizes the rendered sprites with a snapshot.
+
+        Args:
+            state (dict[int, EntityState]): The snapshot entities.
+        """
+        for entity_id in self.views.keys() - state.keys():
+            self.views.pop(entity_id).kill()
+
+        for entity_id, entity in state.items():
+            if entity_id not in self.views:
+                self.views[entity_id] = EntityView(self.get_image(entity), self.camera)
+
+            view = self.views[entity_id]
+            view.image = self.get_image(entity)
+            view.rect = view.image.get_rect(center=entity[1:3])
+
+        if self.player_id in self.views:
+            self.target = self.views[self.player_id]
+
+    async def receive(self, reader: StreamReader) -> None:
+        while True:
+            kind, body = await read_message(reader)
+
+            if kind != SNAPSHOT:
+                continue
+
+            seq, state = decode_snapshot(body, self.snapshots)
+
+            if seq <= self.last_seq:
+                continue
+
+            self.snapshots[seq] = state
+            self.snapshots.pop(seq - SNAPSHOT_HISTORY, None)
+            self.last_seq = seq
+
+            self.apply_snapshot(state)
+
+    def get_pressed_keys(self) -> set[int]:
+        pressed = pygame.key.get_pressed()
+        return {key for key in KEYS if pressed[key]}
+
+    async def run(self) -> None:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        kind, body = await read_message(reader)
+        assert kind == WELCOME, "the server must greet the client first"
+        self.player_id, tick_rate = WELCOME_BODY.unpack(body)
+
+        receiver = asyncio.create_task(self.receive(reader))
+        input_seq = 0
+
+        try:
+            while not receiver.done():
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        return
+
+                input_seq += 1
+                write_message(
+                    writer,
+                    INPUT,
+                    INPUT_BODY.pack(
+                        input_seq, self.last_seq, encode_keys(self.get_pressed_keys())
+                    ),
+                )
+
+                self.screen.fill((0, 0, 0))
+                self.camera.draw(surface=self.screen, target=self.target)
+                pygame.display.update()
+
+                await asyncio.sleep(1 / (FRAME_RATE_LIMITER or tick_rate))
+
+            if isinstance(receiver.exception(), IncompleteReadError):
+                print("Disconnected from the server")
+        finally:
+            receiver.cancel()
+            writer.close()
+            pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Western Shooter arena client")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    asyncio.run(ArenaClient(args.host, args.port).run())
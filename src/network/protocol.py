@@ -0,0 +1,235 @@
+"""Binary protocol shared by the arena server and its clients.
+
+Every message is framed by a header with its type and payload length.
+Snapshots are quantised to whole pixels and delta-compressed against
+the last snapshot acknowledged by the client.
+"""
+
+import struct
+from asyncio import StreamReader, StreamWriter
+
+from pygame import K_LEFT, K_RIGHT, K_DOWN, K_UP, K_SPACE
+
+HEADER = struct.Struct("!BI")
+
+WELCOME = 1
+INPUT = 2
+SNAPSHOT = 3
+
+WELCOME_BODY = struct.Struct("!IB")
+INPUT_BODY = struct.Struct("!IIB")
+SNAPSHOT_HEADER = struct.Struct("!IIHH")
+
+KEYS = (K_UP, K_RIGHT, K_DOWN, K_LEFT, K_SPACE)
+
+KINDS = ("player", "coffin", "cactus", "bullet")
+STATUSES = tuple(
+    f"{direction}{action}"
+    for direction in ("up", "down", "left", "right")
+    for action in ("", "_idle", "_attack")
+)
+
+# Entity state: (kind, x, y, status, frame, health)
+EntityState = tuple[int, int, int, int, int, int]
+
+FULL = struct.Struct("!IBBhhBBB")
+DELTA = struct.Struct("!IB")
+POSITION = struct.Struct("!h")
+POSITION_DELTA = struct.Struct("!b")
+
+CHANGED_X = 1
+CHANGED_Y = 2
+CHANGED_STATUS = 4
+CHANGED_FRAME = 8
+CHANGED_HEALTH = 16
+SMALL_MOVE = 32
+NEW_ENTITY = 64
+
+
+def clamp_coordinate(value: float) -> int:
+    return max(-32768, min(32767, round(value)))
+
+
+class PressedKeys(frozenset):
+    """Set of pressed keys that can be indexed like the result of
+    `pygame.key.get_pressed`.
+    """
+
+    __getitem__ = frozenset.__contains__
+
+
+def encode_keys(pressed: set[int]) -> int:
+    """Packs the pressed keys into a bitmask.
+
+    Args:
+        pressed (set[int]): The pressed key constants.
+
+    Returns:
+        int: The keys bitmask.
+    """
+    return sum(1 << bit for bit, key in enumerate(KEYS) if key in pressed)
+
+
+def decode_keys(mask: int) -> PressedKeys:
+    return PressedKeys(key for bit, key in enumerate(KEYS) if mask & (1 << bit))
+
+
+def encode_snapshot(
+    seq: int,
+    baseline_seq: int,
+    state: dict[int, EntityState],
+    baseline: dict[int, EntityState],
+) -> bytes:
+    """Encodes a snapshot as a delta from a baseline snapshot.
+
+    Args:
+        seq (int): The snapshot sequence number.
+        baseline_seq (int): The sequence of the baseline, 0 when the
+            snapshot is sent in full.
+        state (dict[int, EntityState]): The entities visible to the
+            client, by network id.
+        baseline (dict[int, EntityState]): The entities of the
+            baseline snapshot.
+
+    Returns:
+        bytes: The encoded snapshot body.
+    """
+    removed = [entity_id for entity_id in baseline if entity_id not in state]
+    chunks = []
+
+    for entity_id, entity in state.items():
+        old = baseline.get(entity_id)
+
+        if old is None:
+            chunks.append(FULL.pack(entity_id, NEW_ENTITY, *entity))
+            continue
+
+        if old == entity:
+            continue
+
+        flags = 0
+        fields = b""
+        dx, dy = entity[1] - old[1], entity[2] - old[2]
+
+        if -128 <= dx <= 127 and -128 <= dy <= 127:
+            flags |= SMALL_MOVE
+            x, y, position = dx, dy, POSITION_DELTA
+        else:
+            x, y, position = entity[1], entity[2], POSITION
+
+        if dx:
+            flags |= CHANGED_X
+            fields += position.pack(x)
+        if dy:
+            flags |= CHANGED_Y
+            fields += position.pack(y)
+        if entity[3] != old[3]:
+            flags |= CHANGED_STATUS
+            fields += bytes((entity[3],))
+        if entity[4] != old[4]:
+            flags |= CHANGED_FRAME
+            fields += bytes((entity[4],))
+        if entity[5] != old[5]:
+            flags |= CHANGED_HEALTH
+            fields += bytes((entity[5],))
+
+        chunks.append(DELTA.pack(entity_id, flags) + fields)
+
+    return (
+        SNAPSHOT_HEADER.pack(seq, baseline_seq, len(removed), len(chunks))
+        + struct.pack(f"!{len(removed)}I", *removed)
+        + b"".join(chunks)
+    )
+
+
+def decode_snapshot(
+    body: bytes, baselines: dict[int, dict[int, EntityState]]
+) -> tuple[int, dict[int, EntityState]]:
+    """Rebuilds a snapshot from its delta encoding.
+
+    Args:
+        body (bytes): The encoded snapshot body.
+        baselines (dict[int, dict[int, EntityState]]): The snapshots
+            previously received, by sequence number.
+
+    Returns:
+        tuple[int, dict[int, EntityState]]: The snapshot sequence and
+            its entities, by network id.
+
+    Raises:
+        KeyError: If the baseline snapshot is unknown.
+    """
+    seq, baseline_seq, removed_count, count = SNAPSHOT_HEADER.unpack_from(body)
+    offset = SNAPSHOT_HEADER.size
+
+    state = dict(baselines[baseline_seq]) if baseline_seq else {}
+
+    for entity_id in struct.unpack_from(f"!{removed_count}I", body, offset):
+        state.pop(entity_id, None)
+
+    offset += removed_count * 4
+
+    for _ in range(count):
+        entity_id, flags = DELTA.unpack_from(body, offset)
+
+        if flags & NEW_ENTITY:
+            state[entity_id] = FULL.unpack_from(body, offset)[2:]
+            offset += FULL.size
+            continue
+
+        offset += DELTA.size
+        kind, x, y, status, frame, health = state[entity_id]
+        small = flags & SMALL_MOVE
+        position = POSITION_DELTA if small else POSITION
+
+        if flags & CHANGED_X:
+            value = position.unpack_from(body, offset)[0]
+            x = x + value if small else value
+            offset += position.size
+        if flags & CHANGED_Y:
+            value = position.unpack_from(body, offset)[0]
+            y = y + value if small else value
+            offset += position.size
+        if flags & CHANGED_STATUS:
+            status = body[offset]
+            offset += 1
+        if flags & CHANGED_FRAME:
+            frame = body[offset]
+            offset += 1
+        if flags & CHANGED_HEALTH:
+            health = body[offset]
+            offset += 1
+
+        state[entity_id] = (kind, x, y, status, frame, health)
+
+    return seq, state
+
+
+async def read_message(reader: StreamReader) -> tuple[int, bytes]:
+    """Reads a framed message from a stream.
+
+    Args:
+        reader (StreamReader): The stream to read from.
+
+    Returns:
+        tuple[int, bytes]: The message type and its body.
+    """
+    kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return kind, await reader.readexactly(length)
+
+
+def write_message(writer: StreamWriter, kind: int, body: bytes) -> int:
+    """Writes a framed message to a stream.
+
+    Args:
+        writer (StreamWriter): The stream to write to.
+        kind (int): The message type.
+        body (bytes): The message body.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    message = HEADER.pack(kind, len(body)) + body
+    writer.write(message)
+
+    return len(message)
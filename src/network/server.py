@@ -0,0 +1,310 @@
+"""Headless authoritative arena server.
+
+Run from the project root:
+
+    $ python -m src.network.server [--host HOST] [--port PORT]
+"""
+
+import asyncio
+import argparse
+from time import perf_counter
+from itertools import count
+from collections import deque
+from weakref import WeakKeyDictionary
+from asyncio import IncompleteReadError, StreamReader, StreamWriter
+
+from pygame.rect import Rect
+
+from src.game import Game
+from src.sprites.player import Player
+from src.sprites.enemy import Cactus, Coffin
+from src.sprites.object import Bullet
+from src.network.protocol import (
+    INPUT,
+    SNAPSHOT,
+    STATUSES,
+    WELCOME,
+    INPUT_BODY,
+    WELCOME_BODY,
+    EntityState,
+    PressedKeys,
+    clamp_coordinate,
+    decode_keys,
+    encode_snapshot,
+    read_message,
+    write_message,
+)
+from settings import (
+    NETWORK_VIEW_MARGIN,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_REPORT_INTERVAL,
+    SIMULATION_TICK_RATE,
+    SNAPSHOT_RATE,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+
+KIND_IDS = {Player: 0, Coffin: 1, Cactus: 2, Bullet: 3}
+STATUS_IDS = {status: index for index, status in enumerate(STATUSES)}
+
+SNAPSHOT_HISTORY = 64
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+class RemotePlayer(Player):
+    __slots__ = ("keys", "spawn")
+
+    def __init__(self, position: tuple[int, int], *groups) -> None:
+        super().__init__(position, *groups)
+
+        self.keys = PressedKeys()
+        self.spawn = position
+
+    def controls(self) -> PressedKeys:
+        """Returns the keys last received from the client.
+
+        Returns:
+            PressedKeys: The pressed keys.
+        """
+        return self.keys
+
+    def check_death(self) -> None:
+        """Respawns the player when its health reaches 0, instead of
+        quitting the game.
+        """
+        if self.health <= 0:
+            self.reset(self.spawn)
+
+
+class ClientSession:
+    def __init__(self, writer: StreamWriter, player: RemotePlayer) -> None:
+        self.writer = writer
+        self.player = player
+
+        self.seq = 0
+        self.acked = 0
+        self.history: dict[int, dict[int, EntityState]] = {}
+
+
+class ArenaServer:
+    def __init__(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        tick_rate: int = SIMULATION_TICK_RATE,
+        snapshot_rate: int = SNAPSHOT_RATE,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.step = 1 / tick_rate
+        self.snapshot_interval = max(1, round(tick_rate / snapshot_rate))
+
+        self.game = Game(headless=True)
+
+        # The map player only marks the spawn point, every player in the
+        # arena is controlled by a client.
+        self.spawn = self.game.map["player"].rect.center
+        self.game.map["player"].kill()
+
+        self.sessions: dict[StreamWriter, ClientSession] = {}
+        self.network_ids = WeakKeyDictionary()
+        self.id_counter = count(1)
+
+        self.tick_times = deque(maxlen=tick_rate * SERVER_REPORT_INTERVAL)
+        self.bytes_sent = 0
+
+    def get_network_id(self, sprite) -> int:
+        if sprite not in self.network_ids:
+            self.network_ids[sprite] = next(self.id_counter)
+
+        return self.network_ids[sprite]
+
+    def get_entity_state(self, sprite) -> EntityState:
+        """Quantises the replicated state of a sprite.
+
+        Args:
+            sprite: A player, enemy or bullet.
+
+        Returns:
+            EntityState: The entity state sent to the clients.
+        """
+        x, y = sprite.rect.center
+
+        if isinstance(sprite, Bullet):
+            return KIND_IDS[Bullet], clamp_coordinate(x), clamp_coordinate(y), 0, 0, 0
+
+        animation = sprite.current_animation
+        frame = min(int(animation.index), len(animation.frames_sequence) - 1)
+
+        return (
+            self.get_kind_id(sprite),
+            clamp_coordinate(x),
+            clamp_coordinate(y),
+            STATUS_IDS[sprite.status],
+            frame,
+            max(0, min(255, sprite.health)),
+        )
+
+    def get_kind_id(self, sprite) -> int:
+        for kind, kind_id in KIND_IDS.items():
+            if isinstance(sprite, kind):
+                return kind_id
+
+        raise TypeError(f"{type(sprite).__name__} is not replicated")
+
+    def get_visible_sprites(self, player: RemotePlayer) -> list:
+        """Selects the sprites a client needs, using the cells of the
+        spatial groups around its player.
+
+        Args:
+            player (RemotePlayer): The player of the client.
+
+        Returns:
+            list: The visible players, enemies and bullets.
+        """
+        view = Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT).inflate(
+            NETWORK_VIEW_MARGIN * 2, NETWORK_VIEW_MARGIN * 2
+        )
+        view.center = player.rect.center
+
+        return [
+            *self.game.groups["players"].query_rect(view),
+            *self.game.groups["enemies"].query_rect(view),
+            *(
+                bullet
+                for bullet in self.game.groups["bullets"]
+                if view.colliderect(bullet.rect)
+            ),
+        ]
+
+    def retarget_enemies(self) -> None:
+        """Makes every enemy chase the closest player, searching the
+        cells of the players group around it.
+        """
+        players = self.game.groups["players"]
+
+        for enemy in self.game.groups["enemies"]:
+            closest = players.k_nearest(enemy.pos, 1)
+
+            if closest:
+                enemy.player = closest[0]
+
+    def send(self, session: ClientSession, kind: int, body: bytes) -> None:
+        self.bytes_sent += write_message(session.writer, kind, body)
+
+    def send_snapshots(self) -> None:
+        for session in self.sessions.values():
+            if session.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                continue
+
+            state = {
+                self.get_network_id(sprite): self.get_entity_state(sprite)
+                for sprite in self.get_visible_sprites(session.player)
+            }
+
+            baseline_seq = session.acked if session.acked in session.history else 0
+            session.seq += 1
+
+            body = encode_snapshot(
+                session.seq,
+                baseline_seq,
+                state,
+                session.history.get(baseline_seq, {}),
+            )
+
+            session.history[session.seq] = state
+            session.history.pop(session.seq - SNAPSHOT_HISTORY, None)
+            self.send(session, SNAPSHOT, body)
+
+    async def handle_client(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Spawns a player for a new client and applies its inputs until
+        it disconnects.
+
+        Args:
+            reader (StreamReader): The client input stream.
+            writer (StreamWriter): The client output stream.
+        """
+        player = self.game.create_player(self.spawn, RemotePlayer)
+        session = ClientSession(writer, player)
+        self.sessions[writer] = session
+
+        self.send(
+            session,
+            WELCOME,
+            WELCOME_BODY.pack(self.get_network_id(player), round(1 / self.step)),
+        )
+
+        try:
+            while True:
+                kind, body = await read_message(reader)
+
+                if kind == INPUT:
+                    _, session.acked, keys = INPUT_BODY.unpack(body)
+                    player.keys = decode_keys(keys)
+        except (IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            del self.sessions[writer]
+            player.kill()
+            writer.close()
+
+    def tick(self) -> None:
+        if self.game.spawner is not None:
+            self.game.spawner.update()
+
+        self.retarget_enemies()
+        self.game.update(self.step)
+
+    def report(self) -> None:
+        """Prints the server tick time and the bandwidth per client
+        since the last report, then resets the counters.
+        """
+        clients = len(self.sessions)
+        bandwidth = self.bytes_sent / SERVER_REPORT_INTERVAL
+
+        self.bytes_sent = 0
+
+        tick_avg = sum(self.tick_times) / len(self.tick_times) * 1000
+        tick_max = max(self.tick_times) * 1000
+
+        print(
+            f"clients: {clients:>4} | "
+            f"tick: {tick_avg:6.2f} ms avg {tick_max:6.2f} ms max | "
+            f"bandwidth: {bandwidth / max(clients, 1) / 1024:7.2f} KiB/s per client"
+        )
+
+    async def run(self) -> None:
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"Listening on {self.host}:{self.port}")
+
+        next_tick = perf_counter()
+        next_report = next_tick + SERVER_REPORT_INTERVAL
+        ticks = count()
+
+        async with server:
+            while True:
+                start = perf_counter()
+
+                self.tick()
+
+                if next(ticks) % self.snapshot_interval == 0:
+                    self.send_snapshots()
+
+                self.tick_times.append(perf_counter() - start)
+
+                if start >= next_report:
+                    next_report += SERVER_REPORT_INTERVAL
+                    self.report()
+
+                next_tick = max(next_tick + self.step, perf_counter() - self.step)
+                await asyncio.sleep(max(0, next_tick - perf_counter()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Western Shooter arena server")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    asyncio.run(ArenaServer(args.host, args.port).run())
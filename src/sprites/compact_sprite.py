@@ -0,0 +1,79 @@
+from typing import Any
+
+from pygame.sprite import AbstractGroup
+
+
+class CompactSprite:
+    """Drop-in replacement for `pygame.sprite.Sprite` without instance
+    `__dict__`.
+
+    `pygame.sprite.Sprite` does not declare `__slots__`, so declaring
+    them on its subclasses saves no memory. Subclasses of this class
+    must declare every instance attribute in `__slots__`, and keep
+    per-type constants as class attributes.
+
+    Groups accept these sprites through their duck-typed path, since
+    this class provides the same membership protocol as
+    `pygame.sprite.Sprite`.
+    """
+
+    __slots__ = ("__groups", "__weakref__")
+
+    def __init__(self, *groups: AbstractGroup) -> None:
+        self.__groups = {}
+
+        if groups:
+            self.add(*groups)
+
+    def add(self, *groups: Any) -> None:
+        """Adds the sprite to groups.
+
+        Args:
+            *groups (Any): Groups or iterables of groups.
+        """
+        for group in groups:
+            if hasattr(group, "_spritegroup"):
+                if group not in self.__groups:
+                    group.add_internal(self)
+                    self.add_internal(group)
+            else:
+                self.add(*group)
+
+    def remove(self, *groups: Any) -> None:
+        """Removes the sprite from groups.
+
+        Args:
+            *groups (Any): Groups or iterables of groups.
+        """
+        for group in groups:
+            if hasattr(group, "_spritegroup"):
+                if group in self.__groups:
+                    group.remove_internal(self)
+                    self.remove_internal(group)
+            else:
+                self.remove(*group)
+
+    def add_internal(self, group: AbstractGroup) -> None:
+        self.__groups[group] = None
+
+    def remove_internal(self, group: AbstractGroup) -> None:
+        del self.__groups[group]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def kill(self) -> None:
+        """Removes the sprite from all the groups it belongs to."""
+        for group in self.__groups:
+            group.remove_internal(self)
+
+        self.__groups.clear()
+
+    def groups(self) -> list[AbstractGroup]:
+        return list(self.__groups)
+
+    def alive(self) -> bool:
+        return bool(self.__groups)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} Sprite(in {len(self.__groups)} groups)>"
@@ -3,9 +3,66 @@ from pygutils.timer import Timer
 
 from src.sprites.entity import Entity
 from src.sprites.player import Player
+from src.core.line_of_sight import LineOfSight
+from src.core.behaviour_tree import (
+    Brain,
+    load_behaviours,
+    register_action,
+    register_condition,
+)
+from settings import BEHAVIOURS_PATH, TILE_SIZE
 
 
-class Monster:
+class Monster(Entity):
+    __slots__ = ("player", "brain")
+
+    behaviour: str = ""
+    line_of_sight: LineOfSight | None = None
+
+    notice_radius = 0
+    walk_radius = 0
+    attack_radius = 0
+
+    def __init__(
+        self, position: tuple[int, int], assets_path: str, player: Player, *groups
+    ) -> None:
+        self.player = player
+        self.brain = Brain(load_behaviours(BEHAVIOURS_PATH)[self.behaviour])
+
+        super().__init__(position, assets_path, *groups)
+
+    def reset(self, position: tuple[int, int]) -> None:
+        """Restores the initial state of the monster at a position,
+        forgetting its last decision.
+
+        Args:
+            position (tuple[int, int]): The center of the monster.
+        """
+        super().reset(position)
+
+        self.brain.decision = None
+        self.brain.invalidate()
+
+    def get_decision_key(self) -> tuple:
+        """Returns the inputs of the behaviour tree, so the decision is
+        only evaluated again when one of them changes.
+
+        Returns:
+            tuple: The player and monster tiles, the health and the
+                state of the cooldowns.
+        """
+        player_pos = self.player.pos
+
+        return (
+            player_pos.x // TILE_SIZE,
+            player_pos.y // TILE_SIZE,
+            self.pos.x // TILE_SIZE,
+            self.pos.y // TILE_SIZE,
+            self.health,
+            self.attacking,
+            *(timer.active for timer in self.cooldowns.values()),
+        )
+
     def get_player_distance_direction(self) -> tuple[int, Vector2]:
         """Calculates the distance and direction between the current
         monster and the player.
@@ -23,6 +80,19 @@ class Monster:
 
         return distance, direction
 
+    def can_see_player(self) -> bool:
+        """Checks whether no obstacle stands between the monster and
+        the player. Monsters see through obstacles while no line of
+        sight service is set.
+
+        Returns:
+            bool: Whether the player is visible.
+        """
+        if self.line_of_sight is None:
+            return True
+
+        return self.line_of_sight.is_visible(self.pos, self.player.pos)
+
     def face_player(self, distance: float, direction: Vector2) -> None:
         """Sets the status of the monster based on the distance and
         direction of the player.
@@ -63,27 +133,62 @@ class Monster:
 
     def check_death(self):
         """Check if the health of the character is equal to or below
-        zero, and if so, call the kill() method.
+        zero, and if so, call the kill() method and notify the death.
         """
         if self.health <= 0:
             self.kill()
+            self.events.notify("monster:death", entity=self)
+
+    def decide(self) -> None:
+        """Runs the cached decision of the monster, before the movement
+        is resolved. An attacking monster stands still.
+        """
+        if self.attacking:
+            self.direction = Vector2(0, 0)
+            return
 
+        self.brain.act(self, *self.get_player_distance_direction())
 
-class Coffin(Entity, Monster):
-    def __init__(self, position: tuple[int, int], player: Player, *groups) -> None:
-        self.animation_speed = 15
+    def update(self, dt: float) -> None:
+        """Updates the state of the monster based on the elapsed time,
+        after the movement of the step.
+
+        Args:
+            dt (float): The elapsed time since the last update.
+        """
+        distance, direction = self.get_player_distance_direction()
+
+        for timer in self.cooldowns.values():
+            timer.update()
 
-        super().__init__(position, "graphics/monster/coffin", *groups)
+        self.animate(dt, distance, direction)
+        self.check_death()
+        self.blink()
 
-        self.health = 5
-        self.max_health = self.health
 
-        self.speed = 100
+class Coffin(Monster):
+    __slots__ = ("damage_done",)
 
-        self.player = player
-        self.notice_radius = 550
-        self.walk_radius = 400
-        self.attack_radius = 100
+    behaviour = "coffin"
+
+    animation_speed = 15
+    speed = 100
+    max_health = 5
+
+    notice_radius = 550
+    walk_radius = 400
+    attack_radius = 100
+
+    def __init__(self, position: tuple[int, int], player: Player, *groups) -> None:
+        super().__init__(position, "graphics/monster/coffin", player, *groups)
+
+    def reset(self, position: tuple[int, int]) -> None:
+        """Restores the initial state of the coffin at a position.
+
+        Args:
+            position (tuple[int, int]): The center of the coffin.
+        """
+        super().reset(position)
 
         self.damage_done = False
 
@@ -110,13 +215,14 @@ class Coffin(Entity, Monster):
             self.damage_done = False
             self.cooldowns["attack"].activate()
 
-    def animate(self, dt: float, distance: float) -> None:
+    def animate(self, dt: float, distance: float, direction: Vector2) -> None:
         """Animates the object based on the elapsed time and distance.
 
         Args:
             dt (float): The elapsed time since the last frame.
             distance (float): The distance between the object and the
                 player.
+            direction (Vector2): The direction to the player.
         """
         super().animate(dt)
 
@@ -129,41 +235,29 @@ class Coffin(Entity, Monster):
                 self.player.damage()
                 self.damage_done = True
 
-    def update(self, dt: float) -> None:
-        """Updates the enemy's state and behavior based on the elapsed
-        time.
 
-        Args:
-            dt (float): The elapsed time since the last update.
-        """
-        distance, direction = self.get_player_distance_direction()
+class Cactus(Monster):
+    __slots__ = ("bullet_shot",)
 
-        if not self.attacking:
-            self.face_player(distance, direction)
-            self.walk_to_player(distance, direction)
-            self.attack(distance)
-            self.move(dt, "coffin")
+    behaviour = "cactus"
 
-        for timer in self.cooldowns.values():
-            timer.update()
-
-        self.animate(dt, distance)
-        self.check_death()
-        self.blink()
+    animation_speed = 15
+    speed = 90
 
+    notice_radius = 600
+    walk_radius = 500
+    attack_radius = 350
 
-class Cactus(Entity, Monster):
     def __init__(self, position: tuple[int, int], player: Player, *groups) -> None:
-        self.animation_speed = 15
+        super().__init__(position, "graphics/monster/cactus", player, *groups)
 
-        super().__init__(position, "graphics/monster/cactus", *groups)
+    def reset(self, position: tuple[int, int]) -> None:
+        """Restores the initial state of the cactus at a position.
 
-        self.speed = 90
-
-        self.player = player
-        self.notice_radius = 600
-        self.walk_radius = 500
-        self.attack_radius = 350
+        Args:
+            position (tuple[int, int]): The center of the cactus.
+        """
+        super().reset(position)
 
         self.bullet_shot = False
 
@@ -189,13 +283,14 @@ class Cactus(Entity, Monster):
             self.bullet_shot = False
             self.cooldowns["attack"].activate()
 
-    def animate(self, dt, distance: float, direction: Vector2) -> None:
+    def animate(self, dt: float, distance: float, direction: Vector2) -> None:
         """Animates the object based on the elapsed time and distance.
 
         Args:
             dt (float): The elapsed time since the last frame.
             distance (float): The distance between the object and the
                 player.
+            direction (Vector2): The direction to the player.
         """
         super().animate(dt)
 
@@ -204,7 +299,7 @@ class Cactus(Entity, Monster):
             and self.attacking
             and not self.bullet_shot
         ):
-            if distance < self.attack_radius:
+            if distance < self.attack_radius and self.can_see_player():
                 bullet_pos = self.rect.center + direction * 80
                 self.events.notify(
                     "cactus:attack", position=bullet_pos, direction=direction
@@ -212,24 +307,61 @@ class Cactus(Entity, Monster):
 
                 self.bullet_shot = True
 
-    def update(self, dt: float) -> None:
-        """Updates the enemy's state and behavior based on the elapsed
-        time.
 
-        Args:
-            dt (float): The elapsed time since the last update.
-        """
-        distance, direction = self.get_player_distance_direction()
+@register_condition("player_within")
+def player_within(monster: Monster, distance: float, radius: str) -> bool:
+    return distance <= getattr(monster, radius)
 
-        if not self.attacking:
-            self.face_player(distance, direction)
-            self.walk_to_player(distance, direction)
-            self.shoot(distance)
-            self.move(dt, "cactus")
 
-        for timer in self.cooldowns.values():
-            timer.update()
+@register_condition("player_beyond")
+def player_beyond(monster: Monster, distance: float, radius: str) -> bool:
+    return distance > getattr(monster, radius)
 
-        self.animate(dt, distance, direction)
-        self.check_death()
-        self.blink()
+
+@register_condition("cooldown_ready")
+def cooldown_ready(monster: Monster, distance: float, cooldown: str) -> bool:
+    return not monster.cooldowns[cooldown].active
+
+
+@register_condition("player_visible")
+def player_visible(monster: Monster, distance: float) -> bool:
+    return monster.can_see_player()
+
+
+@register_action("idle")
+def idle(monster: Monster, distance: float, direction: Vector2) -> bool:
+    monster.direction = Vector2(0, 0)
+
+    return distance >= monster.notice_radius
+
+
+@register_action("face")
+def face(monster: Monster, distance: float, direction: Vector2) -> bool:
+    monster.face_player(distance, direction)
+    monster.direction = Vector2(0, 0)
+
+    return distance < monster.notice_radius
+
+
+@register_action("walk")
+def walk(monster: Monster, distance: float, direction: Vector2) -> bool:
+    monster.face_player(distance, direction)
+    monster.walk_to_player(distance, direction)
+
+    return monster.attack_radius < distance < monster.walk_radius
+
+
+@register_action("attack")
+def attack(monster: Coffin, distance: float, direction: Vector2) -> bool:
+    face(monster, distance, direction)
+    monster.attack(distance)
+
+    return monster.attacking
+
+
+@register_action("shoot")
+def shoot(monster: Cactus, distance: float, direction: Vector2) -> bool:
+    face(monster, distance, direction)
+    monster.shoot(distance)
+
+    return monster.attacking
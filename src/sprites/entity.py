@@ -1,9 +1,8 @@
 from abc import ABCMeta, abstractmethod
 from math import sin
-import os
 
 from pygame.math import Vector2
-from pygame.sprite import Sprite
+from pygame.surface import Surface
 from pygame.image import load as load_image
 from pygame.time import get_ticks as get_clock_ticks
 from pygame.mask import from_surface as mask_from_surface
@@ -11,33 +10,75 @@ from pygutils.timer import Timer
 from pygutils.animation import Animation
 from pygutils.event import EventManager
 
+from src.core.mask_cache import get_mask
+from src.core.asset_loader import AssetLoader
+from src.core.asset_bundle import list_animation_files
+from src.sprites.compact_sprite import CompactSprite
+
+
+class Entity(CompactSprite, metaclass=ABCMeta):
+    __slots__ = (
+        "events",
+        "assets",
+        "status",
+        "previous_status",
+        "current_animation",
+        "previous_frame",
+        "image",
+        "rect",
+        "hitbox",
+        "mask",
+        "pos",
+        "prev_pos",
+        "direction",
+        "attacking",
+        "cooldowns",
+        "health",
+    )
+
+    asset_loader: AssetLoader | None = None
+    frames_cache: dict[str, dict[str, list[Surface]]] = {}
+
+    animation_speed = 10
+    speed = 200
+    max_health = 3
 
-class Entity(Sprite, metaclass=ABCMeta):
     def __init__(self, position: tuple[int, int], assets_path: str, *groups) -> None:
         self.events = EventManager()
 
-        self.animation_speed = 10
         self.assets = self.import_assets(assets_path)
+        self.cooldowns = self.init_cooldowns()
+
+        self.reset(position)
+
+        super().__init__(*groups)
+
+    def reset(self, position: tuple[int, int]) -> None:
+        """Restores the initial state of the entity at a position, so
+        it can be reused instead of creating a new one.
+
+        Args:
+            position (tuple[int, int]): The center of the entity.
+        """
         self.status = "down_idle"
         self.previous_status = self.status
-        self.current_animation = self.assets[self.status]
+        self.current_animation = self.create_animation(self.status)
         self.previous_frame = self.current_animation.next()
 
         self.image = self.current_animation.next()
         self.rect = self.image.get_rect(center=position)
         self.hitbox = self.rect.inflate(-self.rect.width * 0.6, -self.rect.height / 2)
-        self.mask = mask_from_surface(self.image)
+        self.mask = get_mask(self.image)
 
         self.pos = Vector2(self.rect.center)
+        self.prev_pos = Vector2(self.pos)
         self.direction = Vector2(0, 0)
-        self.speed = 200
 
         self.attacking = False
-        self.cooldowns = self.init_cooldowns()
-        self.health = 3
-        self.max_health = self.health
+        self.health = self.max_health
 
-        super().__init__(*groups)
+        for timer in self.cooldowns.values():
+            timer.deactivate()
 
     def blink(self) -> None:
         """Toggles the image of the object between its original and a
@@ -73,69 +114,82 @@ class Entity(Sprite, metaclass=ABCMeta):
     def disable_attack(self) -> None:
         self.attacking = False
 
-    def import_assets(self, path: str) -> dict[str, Animation]:
+    def import_assets(self, path: str) -> dict[str, list[Surface]]:
         """Imports assets from the specified path and returns a
-        dictionary mapping animation names to Animation objects.
+        dictionary mapping animation names to their frames. The frames
+        are loaded once and shared by every entity using the same
+        assets.
 
         Args:
             path (str): The path to the directory containing the
                 assets.
 
         Returns:
-            dict[str, Animation]: A dictionary mapping animation
-                names to Animation objects.
+            dict[str, list[Surface]]: A dictionary mapping animation
+                names to their frames.
         """
-        animations = {}
+        if path not in self.frames_cache:
+            self.frames_cache[path] = self.import_frames(path)
+
+        return self.frames_cache[path]
+
+    def create_animation(self, status: str) -> Animation:
+        """Creates the animation for the given status.
 
-        for root, dirs, files in os.walk(path):
-            if not dirs:
-                name = root.split("/")[-1]
-                is_attack_animation = name.endswith("_attack")
+        Only the animation being played is kept by the entity, since
+        switching status always restarts the animation.
 
-                animations[name] = Animation(
-                    [
-                        load_image(f"{root}/{file}").convert_alpha()
-                        for file in sorted(files, key=lambda f: int(f.split(".")[0]))
-                    ],
-                    self.animation_speed,
-                    loop=not is_attack_animation,
-                    on_finish=None if not is_attack_animation else self.disable_attack,
-                )
+        Args:
+            status (str): The status to animate.
+
+        Returns:
+            Animation: The animation, starting at its first frame.
+        """
+        is_attack_animation = status.endswith("_attack")
 
-        return animations
+        return Animation(
+            self.assets[status],
+            self.animation_speed,
+            loop=not is_attack_animation,
+            on_finish=None if not is_attack_animation else self.disable_attack,
+        )
 
-    def move(self, dt: float, entity: str) -> None:
-        """Move the entity based on the given time delta.
+    @classmethod
+    def import_frames(cls, path: str) -> dict[str, list[Surface]]:
+        """Loads the animation frames from the specified path, or takes
+        them from the asset bundle when the asset loader has loaded it.
 
         Args:
-            dt (float): The time delta.
-            entity (str): The name of the entity.
+            path (str): The path to the directory containing the
+                assets.
+
+        Returns:
+            dict[str, list[Surface]]: A dictionary mapping animation
+                names to their frames.
         """
-        if self.direction.magnitude() == 0:
-            return
+        if cls.asset_loader is not None and path in cls.asset_loader.animations:
+            return cls.asset_loader.animations[path]
 
-        self.direction = self.direction.normalize()
+        return {
+            name: [cls.load_frame(file) for file in files]
+            for name, files in list_animation_files(path).items()
+        }
 
-        if self.direction.x != 0:
-            self.pos.x += self.direction.x * self.speed * dt
-            self.rect.centerx = round(self.pos.x)
-            self.hitbox.centerx = self.rect.centerx
+    @classmethod
+    def load_frame(cls, path: str) -> Surface:
+        """Loads an animation frame, reusing the surfaces already
+        loaded by the asset loader when there is one.
 
-            self.events.notify(
-                f"{entity}:move",
-                entity=self,
-                axis="horizontal",
-                direction=self.direction,
-            )
+        Args:
+            path (str): The frame image path.
 
-        if self.direction.y != 0:
-            self.pos.y += self.direction.y * self.speed * dt
-            self.rect.centery = round(self.pos.y)
-            self.hitbox.centery = self.rect.centery
+        Returns:
+            Surface: The converted frame.
+        """
+        if cls.asset_loader is not None:
+            return cls.asset_loader.image(path)
 
-            self.events.notify(
-                f"{entity}:move", entity=self, axis="vertical", direction=self.direction
-            )
+        return load_image(path).convert_alpha()
 
     def animate(self, dt: float) -> None:
         """Animate the object based on the given time interval.
@@ -143,12 +197,11 @@ class Entity(Sprite, metaclass=ABCMeta):
         Args:
             dt (float): The time delta.
         """
-        self.current_animation = self.assets[self.status]
-        self.current_animation.update(dt)
-
         if self.previous_status != self.status:
             self.previous_status = self.status
-            self.current_animation.reset()
+            self.current_animation = self.create_animation(self.status)
+        else:
+            self.current_animation.update(dt)
 
         if self.current_animation.next() == self.previous_frame:
             return
@@ -156,7 +209,15 @@ class Entity(Sprite, metaclass=ABCMeta):
         self.previous_frame = self.current_animation.next()
 
         self.image = self.current_animation.next()
-        self.mask = mask_from_surface(self.image)
+        self.mask = get_mask(self.image)
+
+    @abstractmethod
+    def decide(self) -> None:
+        """Chooses the direction and the actions of the step. It runs
+        for every entity before the movement is resolved, and `update`
+        runs after it.
+        """
+        pass
 
     @abstractmethod
     def init_cooldowns(self) -> dict[str, Timer]:
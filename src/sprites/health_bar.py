@@ -1,15 +1,17 @@
 from pygame import SRCALPHA
 from pygame.math import Vector2
 from pygame.sprite import Group
-from pygame.sprite import Sprite
 from pygame.surface import Surface
 from pygame.draw import rect as draw_rect
 from pygutils.timer import Timer
 
 from src.sprites.entity import Entity
+from src.sprites.compact_sprite import CompactSprite
 
 
-class HealthBar(Sprite):
+class HealthBar(CompactSprite):
+    __slots__ = ("entity", "image", "rect", "alive_timer")
+
     def __init__(self, entity: Entity, *groups: list[Group]) -> None:
         super().__init__(*groups)
 
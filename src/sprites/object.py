@@ -1,11 +1,11 @@
 from pygame.math import Vector2
-from pygame.sprite import Sprite
 from pygame.surface import Surface
-from pygutils.event import EventManager
-from pygame.mask import from_surface as mask_from_surface
 
+from src.core.mask_cache import get_mask
+from src.sprites.compact_sprite import CompactSprite
 
-class Obstacle(Sprite):
+
+class Obstacle(CompactSprite):
     __slots__ = ("image", "rect", "hitbox")
 
     def __init__(self, position: tuple[int, int], surface: Surface, *groups) -> None:
@@ -16,31 +16,31 @@ class Obstacle(Sprite):
         super().__init__(*groups)
 
 
-class Bullet(Sprite):
+class Bullet(CompactSprite):
     __slots__ = (
         "pos",
         "mask",
         "rect",
         "image",
-        "speed",
-        "events",
         "direction",
+        "prev_pos",
         "start_position",
     )
 
+    speed = 500
+
     def __init__(
         self, position: tuple[int, int], direction: Vector2, surface: Surface, *groups
     ) -> None:
-        self.events = EventManager()
         self.start_position = position
 
         self.image = surface
         self.rect = self.image.get_rect(center=position)
-        self.mask = mask_from_surface(self.image)
+        self.mask = get_mask(self.image)
 
         self.pos = Vector2(self.rect.center)
+        self.prev_pos = Vector2(self.pos)
         self.direction = direction
-        self.speed = 500
 
         super().__init__(*groups)
 
@@ -55,6 +55,3 @@ class Bullet(Sprite):
 
         if (self.pos - self.start_position).magnitude() > 700:
             self.kill()
-            return
-
-        self.events.notify("bullet:move", bullet=self)
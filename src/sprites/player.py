@@ -1,4 +1,5 @@
 import sys
+from typing import Sequence
 
 from pygame import quit as quit_game
 from pygame.math import Vector2
@@ -10,19 +11,29 @@ from src.sprites.entity import Entity
 
 
 class Player(Entity):
+    __slots__ = ("bullet_shot",)
+
+    max_health = 10
+
+    keys_map = {
+        K_UP: ("up", Vector2(0, -1)),
+        K_RIGHT: ("right", Vector2(1, 0)),
+        K_DOWN: ("down", Vector2(0, 1)),
+        K_LEFT: ("left", Vector2(-1, 0)),
+    }
+
     def __init__(self, position: tuple[int, int], *groups) -> None:
         super().__init__(position, "graphics/player", *groups)
 
-        self.bullet_shot = False
-        self.health = 10
-        self.max_health = self.health
+    def reset(self, position: tuple[int, int]) -> None:
+        """Restores the initial state of the player at a position.
 
-        self.keys_map = {
-            K_UP: ("up", Vector2(0, -1)),
-            K_RIGHT: ("right", Vector2(1, 0)),
-            K_DOWN: ("down", Vector2(0, 1)),
-            K_LEFT: ("left", Vector2(-1, 0)),
-        }
+        Args:
+            position (tuple[int, int]): The center of the player.
+        """
+        super().reset(position)
+
+        self.bullet_shot = False
 
     def init_cooldowns(self) -> dict[str, Timer]:
         """Initializes the cooldowns for the entity.
@@ -32,6 +43,15 @@ class Player(Entity):
         """
         return {"attack": Timer(1000), "ivulnerable": Timer(300)}
 
+    def controls(self) -> Sequence[bool]:
+        """Returns the state of the keys controlling the player.
+
+        Returns:
+            Sequence[bool]: The pressed state of each key, indexed by
+                key constant.
+        """
+        return get_pressed_key()
+
     def move_input(self) -> None:
         """Moves the player based on the pressed keys.
 
@@ -42,7 +62,7 @@ class Player(Entity):
         self.direction = Vector2(0, 0)
         self.status = f"{self.status.split('_')[0]}_idle"
 
-        pressed_key = get_pressed_key()
+        pressed_key = self.controls()
 
         for key, (status, direction) in self.keys_map.items():
             if pressed_key[key]:
@@ -51,7 +71,7 @@ class Player(Entity):
 
     def attack_input(self):
         """Process the input for attacking."""
-        pressed_key = get_pressed_key()
+        pressed_key = self.controls()
 
         if pressed_key[K_SPACE]:
             self.shoot()
@@ -114,18 +134,24 @@ class Player(Entity):
             quit_game()
             sys.exit()
 
+    def decide(self) -> None:
+        """Reads the input of the step, before the movement is resolved.
+        An attacking player stands still.
+        """
+        if self.attacking:
+            self.direction = Vector2(0, 0)
+            return
+
+        self.move_input()
+        self.attack_input()
+
     def update(self, dt: float) -> None:
         """Update the state of the object based on the given time
-        increment.
+        increment, after the movement of the step.
 
         Args:
             dt (float): The time increment.
         """
-        if not self.attacking:
-            self.move_input()
-            self.attack_input()
-            self.move(dt, "player")
-
         for timer in self.cooldowns.values():
             timer.update()
 
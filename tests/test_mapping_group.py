@@ -0,0 +1,78 @@
+import random
+from math import dist
+
+import pytest
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+
+from src.core.mapping_group import MappingGroup
+
+
+class Box(Sprite):
+    def __init__(self, rect: Rect, *groups) -> None:
+        self.rect = rect
+
+        super().__init__(*groups)
+
+
+@pytest.fixture
+def boxes():
+    rng = random.Random(0)
+    group = MappingGroup(64)
+    sprites = [
+        Box(
+            Rect(
+                rng.randint(-1000, 3000),
+                rng.randint(-1000, 3000),
+                rng.randint(1, 150),
+                rng.randint(1, 150),
+            ),
+            group,
+        )
+        for _ in range(300)
+    ]
+
+    # Moved sprites must be found in their new cells.
+    for sprite in rng.sample(sprites, 100):
+        sprite.rect.move_ip(rng.randint(-500, 500), rng.randint(-500, 500))
+        group.refresh(sprite)
+
+    for sprite in rng.sample(sprites, 20):
+        sprite.kill()
+
+    return rng, group
+
+
+def test_query_rect_matches_brute_force(boxes):
+    rng, group = boxes
+
+    for _ in range(200):
+        rect = Rect(
+            rng.randint(-1500, 3500),
+            rng.randint(-1500, 3500),
+            rng.randint(1, 800),
+            rng.randint(1, 800),
+        )
+        expected = {sprite for sprite in group if rect.colliderect(sprite.rect)}
+
+        assert set(group.query_rect(rect)) == expected
+
+
+def test_k_nearest_matches_brute_force(boxes):
+    rng, group = boxes
+
+    for _ in range(200):
+        position = (rng.uniform(-2000, 4000), rng.uniform(-2000, 4000))
+        k = rng.randint(1, 10)
+        max_radius = rng.choice([None, rng.uniform(50, 1500)])
+
+        distances = sorted(dist(sprite.rect.center, position) for sprite in group)
+
+        if max_radius is not None:
+            distances = [d for d in distances if d <= max_radius]
+
+        found = group.k_nearest(position, k, max_radius)
+
+        assert [dist(sprite.rect.center, position) for sprite in found] == (
+            pytest.approx(distances[:k])
+        )
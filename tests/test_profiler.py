@@ -0,0 +1,32 @@
+from time import perf_counter
+
+from src.core.profiler import SamplingProfiler
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = perf_counter() + seconds
+
+    while perf_counter() < deadline:
+        pass
+
+
+def test_sampling_pass_records_the_stack(tmp_path):
+    profiler = SamplingProfiler(interval_ms=1, budget_ms=1000, output_dir=str(tmp_path))
+    profiler.enable()
+
+    try:
+        profiler.begin_frame()
+
+        with profiler.phase("update"):
+            busy_wait(0.2)
+
+        record = profiler.end_frame()
+    finally:
+        profiler.disable()
+
+    assert record.samples
+    assert any(
+        sample.startswith("update;") and "busy_wait (" in sample
+        for sample in record.samples
+    )
+    assert not profiler.thread.is_alive()